@@ -9,8 +9,17 @@ Pure bash methods usually remove all the whitespace from the yaml which is annoy
 """
 
 import argparse
+import mmap
+import os
 import re
+import shutil
+import tempfile
 import yaml
+try:
+    # Prefer the libyaml C bindings, fall back to the pure-Python loader if libyaml isn't built.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 def read_parameter(filename:str, param_name:str):
     """
@@ -20,9 +29,18 @@ def read_parameter(filename:str, param_name:str):
     """
     # If the param name has one or more "." in it, treat as nested param.
     param_tree = param_name.split(".")
+    # Fast path: if the leaf name doesn't appear anywhere in the file, skip the YAML parse entirely.
+    with open(filename, 'rb') as f:
+        leaf_found = os.fstat(f.fileno()).st_size > 0
+        if leaf_found:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                leaf_found = mm.find(param_tree[-1].encode()) != -1
+    if not leaf_found:
+        print(f"Parameter '{param_name}' not found in {filename}")
+        return None
     # Read the file and find the param.
     with open(filename, 'r') as f:
-        config = yaml.full_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
         # Abuse dynamic typing to recurse through the param tree to the final value.
         for p in param_tree:
             try:
@@ -52,43 +70,94 @@ def replace_parameter(filename:str, param_name:str, new_value:str):
         new_value = str(new_value).lower()
     # If the param name has one or more "." in it, treat as nested param. Also accept ":" as separator.
     param_tree = param_name.replace(':', '.').split(".")
-    # Find the line numbers for each param in the tree, enforcing that they must appear in the same order.
-    with open(filename, "r+") as file:
-        lines = file.readlines()
-        replaced = False
-        match_str:str = ""
-        for i, line in enumerate(lines):
-            # Look for the next param in the tree.
-            param_name = param_tree[0]
-            # Allow param_name to be only partially complete, missing part at either the beginning or end.
-            # So, look for any or no whitespace (\s*), followed by a string with no whitespace which contains param_name (\S*{param_name}\S*), then a colon (:), then anything else (.*).
-            search_pattern = fr"^\s*\S*{param_name}\S*:.*$"
-            if re.search(search_pattern, line):
-                colon_index:int = line.index(":")
+    # Allow each param name to be only partially complete, missing part at either the beginning or end.
+    # So, look for any or no whitespace (\s*), followed by a string with no whitespace which contains the param name (\S*{param}\S*), then a colon (:), then anything else (.*).
+    # The key and the value are captured so the matched line never has to be re-scanned for its colon.
+    # Compile one pattern per level up front rather than rebuilding it for every line.
+    # The file is searched as raw bytes, so the names and patterns are encoded once here too.
+    names = [p.encode() for p in param_tree]
+    patterns = [re.compile(rb"^(\s*)(\S*" + re.escape(n) + rb"\S*?):(.*)$") for n in names]
+    level:int = 0
+    match_str:str = ""
+    with open(filename, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            print(f"Parameter '{param_tree[0]}' not found in {filename}")
+            return
+        # Memory-map the file and jump between occurrences of each param name, so only candidate lines are ever looked at.
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Find the lines for each param in the tree, enforcing that they must appear in the same order.
+            pos:int = 0
+            while True:
+                hit = mm.find(names[level], pos)
+                if hit == -1:
+                    print(f"Parameter '{param_tree[level]}' not found in {filename}")
+                    return
+                line_start = mm.rfind(b"\n", 0, hit) + 1
+                line_end = mm.find(b"\n", hit)
+                line_end = len(mm) if line_end == -1 else line_end + 1
+                pos = line_end
+                line = mm[line_start:line_end]
+                match = patterns[level].search(line)
+                if not match:
+                    continue
                 # Since the regex works even for partial param name, fill with true name for output confirmation message.
-                match_str += ("" if match_str == "" else ".") + line[:colon_index].strip()
-                if len(param_tree) > 1:
+                match_str += ("" if match_str == "" else ".") + match.group(2).decode()
+                if level < len(param_tree) - 1:
                     # If this is not the terminal node, keep searching.
-                    param_tree = param_tree[1:]
+                    level += 1
                     continue
-                # Preserve the line's structure, just replacing the arg value.
-                # Assume the line is in the format `  param: value # comment`
-                if "#" in line:
-                    comment_index:int = line.index("#")
-                    new_line = line[:colon_index+1] + " " + new_value + " " + line[comment_index:]
-                else:
-                    # If there is no comment, use the end of the line.
-                    new_line = line[:colon_index+1] + " " + new_value + "\n"
-                lines[i] = new_line
-                replaced = True
                 break
 
-        if replaced:
-            with open(filename, "w") as file:
-                file.writelines(lines)
-            print(f"Replaced parameter '{match_str}' with '{new_value}' in {filename}")
-        else:
-            print(f"Parameter '{param_name}' not found in {filename}")
+            # Preserve the line's structure, just replacing the arg value.
+            # Assume the line is in the format `  param: value # comment`
+            # Split off the line ending once so it is carried over as-is (\n, \r\n, or none on the last line).
+            body = line.splitlines()[0]
+            line_ending = line[len(body):]
+            new_line = body[:match.end(2)+1] + b" " + new_value.encode()
+            comment_index:int = body.find(b"#", match.start(3))
+            if comment_index != -1:
+                new_line += b" " + body[comment_index:]
+            new_line += line_ending
+
+            # Edit the file the path resolves to, so a symlinked config keeps its link and only the target changes.
+            real_path = os.path.realpath(filename)
+            file_stat = os.fstat(file.fileno())
+            if file_stat.st_nlink > 1:
+                # Renaming over a hardlinked file would split it from its other names, so rewrite it in place instead.
+                # The mapping reads from the file being truncated, so copy everything out of it first.
+                in_place_data = b"".join((mm[:line_start], new_line, mm[line_end:]))
+            else:
+                in_place_data = None
+                # Write the untouched head and tail straight from the mapping into a temp file next to the original.
+                with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(real_path), delete=False) as tmp:
+                    try:
+                        with memoryview(mm) as view:
+                            tmp.write(view[:line_start])
+                            tmp.write(new_line)
+                            tmp.write(view[line_end:])
+                    except BaseException:
+                        tmp.close()
+                        os.remove(tmp.name)
+                        raise
+
+    if in_place_data is not None:
+        with open(real_path, "wb") as file:
+            file.write(in_place_data)
+    else:
+        try:
+            # The temp file is created owner-only and owned by whoever runs this, so carry the original file's
+            # permissions and, where allowed, its owner over before the swap.
+            shutil.copymode(real_path, tmp.name)
+            if hasattr(os, "chown"):
+                try:
+                    os.chown(tmp.name, file_stat.st_uid, file_stat.st_gid)
+                except PermissionError:
+                    pass
+            os.replace(tmp.name, real_path)
+        except BaseException:
+            os.remove(tmp.name)
+            raise
+    print(f"Replaced parameter '{match_str}' with '{new_value}' in {filename}")
 
 
 def main():
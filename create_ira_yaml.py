@@ -2,9 +2,15 @@
 # config_updater.py
 
 import argparse
+import copy
 import yaml
 import os
-from typing import Any, Dict, List
+try:
+    # Prefer the libyaml C bindings, fall back to the pure-Python versions if libyaml isn't built.
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+from typing import Any, Dict
 
 # 1. Define the YAML content as a string 
 YAML_CONFIG_STRING = """
@@ -35,14 +41,8 @@ isaacsim.replicator.agent:
       # ... (rest of the parameters)
 """
 
-def get_nested_key(data: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
-    """Helper function to traverse the nested dictionary to the parent of the final key."""
-    current = data
-    for key in keys[:-1]:
-        if key not in current:
-            raise KeyError(f"Key '{key}' not found in the configuration path.")
-        current = current[key]
-    return current
+# Parse the template once at import; each update works on a deep copy so the template stays pristine.
+_BASE_CONFIG: Dict[str, Any] = yaml.load(YAML_CONFIG_STRING, Loader=SafeLoader)
 
 
 def update_and_save_config(scene_asset_path: str, char_command_file: str):
@@ -50,39 +50,25 @@ def update_and_save_config(scene_asset_path: str, char_command_file: str):
     Loads the original configuration, updates the specified values,
     and saves the new configuration to the Downloads folder.
     """
-    # Load the YAML content from the string (simulating reading from a file)
-    config = yaml.full_load(YAML_CONFIG_STRING)
+    # Copy the template parsed at import (simulating reading from a file)
+    config = copy.deepcopy(_BASE_CONFIG)
 
-    # --- 1. Update scene.asset_path ---
+    # Start from the dictionary that is the value of the ROOT_KEY
     ROOT_KEY = "isaacsim.replicator.agent"
-    NESTED_PATH_SCENE = "scene.asset_path" 
-    
-    # Start traversal from the dictionary that is the value of the ROOT_KEY
     start_config = config.get(ROOT_KEY)
     if start_config is None:
         print(f"Error: Root key '{ROOT_KEY}' not found in the configuration.")
         return
 
-    path_scene_list = NESTED_PATH_SCENE.split('.')
+    # --- 1. Update scene.asset_path and 2. character.command_file ---
+    # Both paths are fixed, so index them directly rather than walking a key list.
     try:
-        # Pass the sub-dictionary and the list of nested keys to the helper function
-        parent_dict = get_nested_key(start_config, path_scene_list) 
-        parent_dict[path_scene_list[-1]] = scene_asset_path
+        start_config["scene"]["asset_path"] = scene_asset_path
         print(f"Updated scene.asset_path to: {scene_asset_path}")
-    except KeyError as e:
-        print(f"Error updating scene.asset_path: {e}")
-        return
-
-    # --- 2. Update character.command_file ---
-    NESTED_PATH_CHAR = "character.command_file"
-    path_char_list = NESTED_PATH_CHAR.split('.')
-    try:
-        # Pass the sub-dictionary and the list of nested keys to the helper function
-        parent_dict = get_nested_key(start_config, path_char_list)
-        parent_dict[path_char_list[-1]] = char_command_file
+        start_config["character"]["command_file"] = char_command_file
         print(f"Updated character.command_file to: {char_command_file}")
     except KeyError as e:
-        print(f"Error updating character.command_file: {e}")
+        print(f"Error updating configuration: Key {e} not found in the configuration path.")
         return
 
     # --- 3. Save the new configuration file ---
@@ -93,8 +79,10 @@ def update_and_save_config(scene_asset_path: str, char_command_file: str):
     
     # Save the updated dictionary back to a new YAML file
     # The 'sort_keys=False' is important to keep the original parameter order
-    with open(new_filename, 'w') as f:
-        yaml.dump(config, f, sort_keys=False)
+    # A wide line width stops the emitter from folding long values (e.g. asset paths) across lines,
+    # and the large write buffer lets the whole document go out in a single write.
+    with open(new_filename, 'w', buffering=1 << 20) as f:
+        yaml.dump(config, f, Dumper=SafeDumper, sort_keys=False, default_flow_style=False, width=10_000)
     
     print(f"\n✅ Successfully created new config file at: {new_filename}")
 
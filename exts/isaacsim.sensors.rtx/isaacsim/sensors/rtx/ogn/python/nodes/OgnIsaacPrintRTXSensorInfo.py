@@ -10,9 +10,13 @@ import ctypes
 import sys
 
 import carb
+import carb.settings
 import numpy as np
+import omni.sensors.nv.common.bindings._common as common
 from omni.syntheticdata._syntheticdata import acquire_syntheticdata_interface
 
+PRINT_ENABLED_SETTING = "/exts/isaacsim.sensors.rtx/printRTXSensorInfo/enabled"
+
 
 def object_id_to_prim_path(object_id):
     """Given an ObjectId get a Prim Path
@@ -26,6 +30,19 @@ def object_id_to_prim_path(object_id):
     return acquire_syntheticdata_interface().get_uri_from_instance_segmentation_id(int(object_id))
 
 
+def object_ids_to_prim_paths(object_ids):
+    """Given a sequence of ObjectIds get their Prim Paths, acquiring the syntheticdata interface once
+
+    Args:
+        object_ids (list[int]): object ids, like from a RTX sensor return
+
+    Returns:
+        list of prim path strings, in the same order as object_ids
+    """
+    get_uri = acquire_syntheticdata_interface().get_uri_from_instance_segmentation_id
+    return [get_uri(int(object_id)) for object_id in object_ids]
+
+
 class OgnIsaacPrintRTXSensorInfo:
     """
     Print raw RTX sensor data to console. Example of using omni.sensors Python bindings in OmniGraph node.
@@ -34,53 +51,61 @@ class OgnIsaacPrintRTXSensorInfo:
     @staticmethod
     def compute(db) -> bool:
         """read a pointer and print data from it assuming it is Rtx"""
+        # Skip reading and formatting the frame entirely when printing has been turned off. An unset setting
+        # (e.g. no extension.toml default loaded) keeps printing, as the node always did
+        if carb.settings.get_settings().get(PRINT_ENABLED_SETTING) is False:
+            return True
+
         if not db.inputs.dataPtr:
             carb.log_warn("invalid data input to OgnIsaacPrintRTXSensorInfo")
             return True
 
-        import omni.sensors.nv.common.bindings._common as common
-
-        # Reach 28 bytes into the GMO data buffer using the pointer address
-        size_buffer = (ctypes.c_char * 28).from_address(db.inputs.dataPtr)
-        # Resolve bytes 16-23 as a uint64, corresponding to GMO size_in_bytes field
-        gmo_size = int(np.frombuffer((size_buffer[16:24]), np.uint64)[0])
+        # Resolve bytes 16-23 of the GMO data buffer as a uint64, corresponding to GMO size_in_bytes field
+        gmo_size = ctypes.c_uint64.from_address(db.inputs.dataPtr + 16).value
         # Use size_in_bytes field to get full GMO buffer
         buffer = (ctypes.c_char * gmo_size).from_address(db.inputs.dataPtr)
         # Retrieve GMO data from buffer as struct with well-defined fields
         gmo_data = common.getModelOutputFromBuffer(buffer)
 
-        print("-------------------- NEW FRAME ------------------------------------------")
-        print("-------------------- gmo:")
-        print(f"frameId:     {gmo_data.frameId}")
-        print(f"timestampNs: {gmo_data.timestampNs}")
-        print(f"numElements: {gmo_data.numElements}")
-        print(f"auxType: {gmo_data.auxType}")
-        if gmo_data.numElements > 0:
-            print(f"Return 0:")
-            print(f"    timeOffsetNs: {gmo_data.timeOffSetNs[0]}")
-            print(f"    azimuth:      {gmo_data.x[0]}")
-            print(f"    elevation:    {gmo_data.y[0]}")
-            print(f"    range:        {gmo_data.z[0]}")
-            print(f"    intensity:    {gmo_data.scalar[0]}")
-            print(f"Return {gmo_data.numElements - 1}:")
-            print(f"    timeOffsetNs: {gmo_data.timeOffSetNs[gmo_data.numElements - 1]}")
-            print(f"    azimuth:      {gmo_data.x[gmo_data.numElements - 1]}")
-            print(f"    elevation:    {gmo_data.y[gmo_data.numElements - 1]}")
-            print(f"    range:        {gmo_data.z[gmo_data.numElements - 1]}")
-            print(f"    intensity:    {gmo_data.scalar[gmo_data.numElements - 1]}")
+        # Build the whole frame report first and write it to stdout once
+        num_elements = gmo_data.numElements
+        lines = [
+            "-------------------- NEW FRAME ------------------------------------------",
+            "-------------------- gmo:",
+            f"frameId:     {gmo_data.frameId}",
+            f"timestampNs: {gmo_data.timestampNs}",
+            f"numElements: {num_elements}",
+            f"auxType: {gmo_data.auxType}",
+        ]
+        if num_elements > 0:
+            for i in (0, num_elements - 1):
+                lines += [
+                    f"Return {i}:",
+                    f"    timeOffsetNs: {gmo_data.timeOffSetNs[i]}",
+                    f"    azimuth:      {gmo_data.x[i]}",
+                    f"    elevation:    {gmo_data.y[i]}",
+                    f"    range:        {gmo_data.z[i]}",
+                    f"    intensity:    {gmo_data.scalar[i]}",
+                ]
 
         # NOTE: Material mapping only valid for Lidar data currently
         if gmo_data.modality == common.Modality.LIDAR and gmo_data.aux_type == common.AuxType.FULL:
-            print(f"Prim <-> Material mapping:")
-            material_mapping = {}
-            for i in range(gmo_data.numElements):
-                objId = gmo_data.objId[i]
-                matId = gmo_data.matId[i]
-                if gmo_data.z[i] > 0.0 and gmo_data.scalar[i] > 0.0:
-                    if objId not in material_mapping:
-                        material_mapping[objId] = matId
-
-            for obj in material_mapping:
-                prim_path = object_id_to_prim_path(obj)
-                print(f"objectId {obj} with prim path {prim_path} has material ID {material_mapping[obj]}.")
+            lines.append("Prim <-> Material mapping:")
+            obj_ids = np.asarray(gmo_data.objId)[:num_elements]
+            mat_ids = np.asarray(gmo_data.matId)[:num_elements]
+            # Only returns with positive range and intensity hit an object
+            valid = (np.asarray(gmo_data.z)[:num_elements] > 0.0) & (np.asarray(gmo_data.scalar)[:num_elements] > 0.0)
+            valid_obj_ids = obj_ids[valid]
+            valid_mat_ids = mat_ids[valid]
+            # Keep the material of the first return for each object, in the order objects were first seen
+            unique_obj_ids, first_idx = np.unique(valid_obj_ids, return_index=True)
+            order = np.argsort(first_idx)
+            material_mapping = dict(zip(unique_obj_ids[order].tolist(), valid_mat_ids[first_idx[order]].tolist()))
+
+            prim_paths = object_ids_to_prim_paths(material_mapping.keys())
+            for (obj, mat), prim_path in zip(material_mapping.items(), prim_paths):
+                lines.append(f"objectId {obj} with prim path {prim_path} has material ID {mat}.")
+
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
         return True
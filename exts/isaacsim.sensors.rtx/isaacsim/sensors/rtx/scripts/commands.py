@@ -20,6 +20,54 @@ from isaacsim.core.utils.xforms import reset_and_set_xform_ops
 from pxr import Gf, PhysxSchema, Sdf, UsdGeom
 
 
+_ALLOWED_SENSOR_TYPE_TOKENS = ["camera", "radar", "lidar"]
+
+
+def _create_rtx_sensor(
+    stage,
+    prim_path: str,
+    sensor_type: str,
+    plugin_name: str,
+    config: str,
+    translation: Gf.Vec3d,
+    orientation: Gf.Quatd,
+    visibility: bool = True,
+    schema_api=None,
+):
+    """Define a camera prim at prim_path and author the attributes shared by all RTX sensors on it
+
+    Args:
+        stage (Usd.Stage): stage to create the sensor on
+        prim_path (str): free path for the new sensor prim
+        sensor_type (str): value of the cameraSensorType token, one of _ALLOWED_SENSOR_TYPE_TOKENS
+        plugin_name (str): omni.sensors plugin implementing the sensor model
+        config (str): sensor model config name
+        translation (Gf.Vec3d): local translation of the sensor
+        orientation (Gf.Quatd): local orientation of the sensor
+        visibility (bool): when False the prim is made invisible
+        schema_api: optional IsaacSensorSchema API class to apply to the prim
+
+    Returns:
+        the created prim
+    """
+    prim = UsdGeom.Camera.Define(stage, Sdf.Path(prim_path)).GetPrim()
+    if schema_api is not None:
+        schema_api.Apply(prim)
+    # Coalesce the attribute authoring below into a single change notification.
+    # Schema application and xform ops stay outside, as they read back composed prim data.
+    with Sdf.ChangeBlock():
+        # The prim was just defined, so allowedTokens can be authored without checking for an existing value
+        camSensorTypeAttr = prim.CreateAttribute("cameraSensorType", Sdf.ValueTypeNames.Token, False)
+        camSensorTypeAttr.Set(sensor_type)
+        camSensorTypeAttr.SetMetadata("allowedTokens", _ALLOWED_SENSOR_TYPE_TOKENS)
+        prim.CreateAttribute("sensorModelPluginName", Sdf.ValueTypeNames.String, False).Set(plugin_name)
+        prim.CreateAttribute("sensorModelConfig", Sdf.ValueTypeNames.String, False).Set(config)
+    if visibility is False:
+        UsdGeom.Imageable(prim).MakeInvisible()
+    reset_and_set_xform_ops(prim, translation, orientation)
+    return prim
+
+
 class IsaacSensorCreateRtxLidar(omni.kit.commands.Command):
     def __init__(
         self,
@@ -40,20 +88,17 @@ class IsaacSensorCreateRtxLidar(omni.kit.commands.Command):
     def do(self):
         self._stage = omni.usd.get_context().get_stage()
         self._prim_path = get_next_free_path(self._path, self._parent)
-        self._prim = UsdGeom.Camera.Define(self._stage, Sdf.Path(self._prim_path)).GetPrim()
-        IsaacSensorSchema.IsaacRtxLidarSensorAPI.Apply(self._prim)
-        camSensorTypeAttr = self._prim.CreateAttribute("cameraSensorType", Sdf.ValueTypeNames.Token, False)
-        camSensorTypeAttr.Set("lidar")
-        tokens = camSensorTypeAttr.GetMetadata("allowedTokens")
-        if not tokens:
-            camSensorTypeAttr.SetMetadata("allowedTokens", ["camera", "radar", "lidar"])
-        self._prim.CreateAttribute("sensorModelPluginName", Sdf.ValueTypeNames.String, False).Set(
-            "omni.sensors.nv.lidar.lidar_core.plugin"
+        self._prim = _create_rtx_sensor(
+            self._stage,
+            self._prim_path,
+            "lidar",
+            "omni.sensors.nv.lidar.lidar_core.plugin",
+            self._config,
+            self._translation,
+            self._orientation,
+            visibility=self._visibility,
+            schema_api=IsaacSensorSchema.IsaacRtxLidarSensorAPI,
         )
-        self._prim.CreateAttribute("sensorModelConfig", Sdf.ValueTypeNames.String, False).Set(self._config)
-        if self._visibility is False:
-            UsdGeom.Imageable(self._prim).MakeInvisible()
-        reset_and_set_xform_ops(self._prim.GetPrim(), self._translation, self._orientation)
 
         if self._prim:
             return self._prim
@@ -86,19 +131,16 @@ class IsaacSensorCreateRtxIDS(omni.kit.commands.Command):
     def do(self):
         self._stage = omni.usd.get_context().get_stage()
         self._prim_path = get_next_free_path(self._path, self._parent)
-        self._prim = UsdGeom.Camera.Define(self._stage, Sdf.Path(self._prim_path)).GetPrim()
-        camSensorTypeAttr = self._prim.CreateAttribute("cameraSensorType", Sdf.ValueTypeNames.Token, False)
-        camSensorTypeAttr.Set("lidar")
-        tokens = camSensorTypeAttr.GetMetadata("allowedTokens")
-        if not tokens:
-            camSensorTypeAttr.SetMetadata("allowedTokens", ["camera", "radar", "lidar"])
-        self._prim.CreateAttribute("sensorModelPluginName", Sdf.ValueTypeNames.String, False).Set(
-            "omni.sensors.nv.ids.ids.plugin"
+        self._prim = _create_rtx_sensor(
+            self._stage,
+            self._prim_path,
+            "lidar",
+            "omni.sensors.nv.ids.ids.plugin",
+            self._config,
+            self._translation,
+            self._orientation,
+            visibility=self._visibility,
         )
-        self._prim.CreateAttribute("sensorModelConfig", Sdf.ValueTypeNames.String, False).Set(self._config)
-        if self._visibility is False:
-            UsdGeom.Imageable(self._prim).MakeInvisible()
-        reset_and_set_xform_ops(self._prim.GetPrim(), self._translation, self._orientation)
 
         if self._prim:
             return self._prim
@@ -130,18 +172,16 @@ class IsaacSensorCreateRtxRadar(omni.kit.commands.Command):
     def do(self):
         self._stage = omni.usd.get_context().get_stage()
         self._prim_path = get_next_free_path(self._path, self._parent)
-        self._prim = UsdGeom.Camera.Define(self._stage, Sdf.Path(self._prim_path)).GetPrim()
-        IsaacSensorSchema.IsaacRtxRadarSensorAPI.Apply(self._prim)
-        camSensorTypeAttr = self._prim.CreateAttribute("cameraSensorType", Sdf.ValueTypeNames.Token, False)
-        camSensorTypeAttr.Set("radar")
-        tokens = camSensorTypeAttr.GetMetadata("allowedTokens")
-        if not tokens:
-            camSensorTypeAttr.SetMetadata("allowedTokens", ["camera", "radar", "lidar"])
-        self._prim.CreateAttribute("sensorModelPluginName", Sdf.ValueTypeNames.String, False).Set(
-            "omni.sensors.nv.radar.wpm_dmatapprox.plugin"
+        self._prim = _create_rtx_sensor(
+            self._stage,
+            self._prim_path,
+            "radar",
+            "omni.sensors.nv.radar.wpm_dmatapprox.plugin",
+            self._config,
+            self._translation,
+            self._orientation,
+            schema_api=IsaacSensorSchema.IsaacRtxRadarSensorAPI,
         )
-        self._prim.CreateAttribute("sensorModelConfig", Sdf.ValueTypeNames.String, False).Set(self._config)
-        reset_and_set_xform_ops(self._prim.GetPrim(), self._translation, self._orientation)
 
         if self._prim:
             return self._prim
@@ -7,8 +7,6 @@
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
 
-import asyncio
-
 import isaacsim.core.utils.numpy.rotations as rot_utils
 import numpy as np
 import omni.kit.test
@@ -63,7 +61,7 @@ class TestRotatingLidarRtx(omni.kit.test.AsyncTestCase):
         await omni.kit.app.get_app().next_update_async()
         while omni.usd.get_context().get_stage_loading_status()[2] > 0:
             # print("tearDown, assets still loading, waiting to finish...")
-            await asyncio.sleep(1.0)
+            await omni.kit.app.get_app().next_update_async()
         await omni.kit.app.get_app().next_update_async()
         return
 
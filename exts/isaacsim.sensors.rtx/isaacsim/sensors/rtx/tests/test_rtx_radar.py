@@ -11,8 +11,6 @@
 #   omni.kit.test - std python's unittest module with additional wrapping to add suport for async/await tests
 #   For most things refer to unittest docs: https://docs.python.org/3/library/unittest.html
 
-import asyncio
-
 import carb
 import numpy as np
 import omni.kit
@@ -44,7 +42,7 @@ class TestRTXRadar(omni.kit.test.AsyncTestCase):
         await omni.kit.app.get_app().next_update_async()
         while omni.usd.get_context().get_stage_loading_status()[2] > 0:
             # print("tearDown, assets still loading, waiting to finish...")
-            await asyncio.sleep(1.0)
+            await omni.kit.app.get_app().next_update_async()
         await omni.kit.app.get_app().next_update_async()
 
         self._settings = None
@@ -11,7 +11,7 @@
 #   omni.kit.test - std python's unittest module with additional wrapping to add suport for async/await tests
 #   For most things refer to unittest docs: https://docs.python.org/3/library/unittest.html
 
-import asyncio
+import math
 import sys
 
 import carb
@@ -28,6 +28,150 @@ from isaacsim.core.utils.prims import delete_prim
 from isaacsim.core.utils.stage import create_new_stage_async, update_stage_async
 from isaacsim.sensors.rtx import LidarRtx
 
+try:
+    import numba
+except ImportError:
+    # numba is optional, without it the ground truth is computed with plain NumPy
+    numba = None
+try:
+    import cupy
+except ImportError:
+    # cupy is optional, without it frames are always handled as host NumPy arrays
+    cupy = None
+
+
+# Constants of the quadrant fold, evaluated once rather than per frame
+_QUARTER_PI = np.pi / 4.0
+_HALF_PI = np.pi / 2.0
+
+
+def _get_array_module(x):
+    """Return cupy for device-resident arrays and numpy otherwise.
+
+    The helpers below only call np ufuncs and functions that CuPy overrides, so a device array stays on the device
+    and only the final error scalar crosses to the host.
+    """
+    return np if cupy is None else cupy.get_array_module(x)
+
+
+def _asarray(x):
+    """Like np.asarray, but keeps device arrays on the device."""
+    return _get_array_module(x).asarray(x)
+
+
+def _fold_quadrant(az):
+    """Reduce azimuths into [-45, 45] degrees by subtracting the nearest multiple of 90 degrees.
+
+    Args:
+        az (np.ndarray): azimuth of each return in radians
+
+    Returns:
+        np.ndarray: folded azimuth of each return in radians
+    """
+    return np.remainder(az + _QUARTER_PI, _HALF_PI) - _QUARTER_PI
+
+
+if numba is not None:
+
+    # Strict IEEE math, so the ground truth doesn't depend on whether numba is installed, and no on-disk cache,
+    # which would write into the installed extension's __pycache__
+    @numba.njit(parallel=True)
+    def _expected_cube_range_kernel(az, cos_el, edge_length, out):
+        """Compiled version of _expected_cube_range, writing the expected range of each return into out."""
+        for p in numba.prange(az.shape[0]):
+            # Python's float % is a floored modulo, matching np.remainder in _fold_quadrant
+            az_adj = (az[p] + _QUARTER_PI) % _HALF_PI - _QUARTER_PI
+            out[p] = edge_length / (2.0 * math.cos(az_adj) * cos_el[p])
+
+
+def _expected_cube_range(az, edge_length, cos_el=None):
+    """Expected range from the center of an axis-aligned cube to its surface, for every return at once.
+
+    Args:
+        az (np.ndarray): azimuth of each return in radians
+        edge_length (float): edge length of the cube
+        cos_el (np.ndarray, optional): cosine of the elevation of each return. Defaults to None, treated as zero elevation.
+
+    Returns:
+        np.ndarray: expected range of each return
+    """
+    if numba is not None and _get_array_module(az) is np:
+        # The kernel works on flat arrays; range images are flattened and the result reshaped back
+        shape = np.shape(az)
+        az = np.ascontiguousarray(az, dtype=np.float64).ravel()
+        # cos_el may be a per-channel column that broadcasts across the image, so expand it before flattening
+        cos_el = np.ones_like(az) if cos_el is None else np.broadcast_to(cos_el, shape).astype(np.float64).ravel()
+        out = np.empty_like(az)
+        _expected_cube_range_kernel(az, cos_el, float(edge_length), out)
+        return out.reshape(shape)
+
+    # Adjust azimuth to appropriate angle in [-45, 45], then compute expected range to face, edge, or corner of cube
+    range_expected = edge_length / (2.0 * np.cos(_fold_quadrant(az)))
+    if cos_el is not None:
+        range_expected /= cos_el
+    return range_expected
+
+
+def _as_range_image(frame, n_channels):
+    """Reshape the flat range/azimuth/elevation arrays of a frame into (n_channels, n_columns) range images.
+
+    Returns are assumed to be ordered firing by firing, with every channel of a firing stored consecutively.
+
+    Args:
+        frame (dict): current frame of the sensor
+        n_channels (int): number of laser channels, i.e. distinct beam elevations
+
+    Returns:
+        dict: range, azimuth and elevation images, or None if the returns do not fill whole columns
+    """
+    num_points = len(frame["range"])
+    if n_channels <= 0 or num_points % n_channels:
+        return None
+    return {k: _asarray(frame[k]).reshape(-1, n_channels).T for k in ("range", "azimuth", "elevation")}
+
+
+def _assert_ranges_close(actual, expected, rtol=1e-2):
+    """Assert every measured range is within rtol of its expected range, in a single vectorized check.
+
+    Args:
+        actual (np.ndarray): measured range of each return
+        expected (np.ndarray): expected range of each return
+        rtol (float, optional): relative tolerance. Defaults to 1e-2.
+    """
+    xp = _get_array_module(actual)
+    if xp is not np:
+        # Reduce on the device and copy back only the worst relative error
+        max_err = float(xp.max(xp.abs(actual - expected) / xp.abs(expected))) if actual.size else 0.0
+        if not max_err <= rtol:
+            raise AssertionError(f"max relative error {max_err} exceeds rtol={rtol}")
+        return
+    try:
+        np.testing.assert_allclose(actual, expected, rtol=rtol, atol=0.0)
+    except AssertionError as e:
+        # Only pay for locating the worst return when the check has already failed
+        worst = int(np.argmax(np.abs(actual - expected) / np.abs(expected)))
+        raise AssertionError(
+            f"{e}\nmax relative error at return {worst}: measured {actual[worst]}, expected {expected[worst]}"
+        ) from None
+
+
+def _validate_cube_ranges(ranges, az, edge_length, *, cos_el=None, rtol=1e-2, mask=None):
+    """Check measured ranges against the cube ground truth: quadrant fold, expected range and tolerance in one call.
+
+    Args:
+        ranges (np.ndarray): measured range of each return, flat or as a range image
+        az (np.ndarray): azimuth of each return in radians, same shape as ranges
+        edge_length (float): edge length of the cube
+        cos_el (np.ndarray, optional): cosine of the elevation, broadcastable to ranges. Defaults to None, zero elevation.
+        rtol (float, optional): relative tolerance. Defaults to 1e-2.
+        mask (np.ndarray, optional): boolean mask of the returns to check, e.g. to skip dropped returns. Defaults to None.
+    """
+    expected = _expected_cube_range(az, edge_length, cos_el)
+    if mask is not None:
+        ranges = ranges[mask]
+        expected = expected[mask]
+    _assert_ranges_close(ranges, expected, rtol=rtol)
+
 
 # Having a test class dervived from omni.kit.test.AsyncTestCase declared on the root of module will make it auto-discoverable by omni.kit.test
 class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
@@ -49,7 +193,7 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
         await omni.kit.app.get_app().next_update_async()
         while omni.usd.get_context().get_stage_loading_status()[2] > 0:
             # print("tearDown, assets still loading, waiting to finish...")
-            await asyncio.sleep(1.0)
+            await omni.kit.app.get_app().next_update_async()
         await omni.kit.app.get_app().next_update_async()
         # self._usd_context = omni.usd.get_context()
         # self._usd_context.close_stage()
@@ -61,6 +205,18 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
 
         self._settings = None
 
+    async def test_fold_quadrant(self):
+        """
+        Tests the modular azimuth fold matches the floor-based fold it replaced, across several revolutions.
+        """
+        az = np.linspace(-4.0 * np.pi, 4.0 * np.pi, 100001)
+        az_adj = az + (1 - np.floor((3 * np.pi / 4.0 + az) / (np.pi / 2.0))) * np.pi / 2.0
+        az_fold = _fold_quadrant(az)
+        self.assertTrue(np.all(np.abs(az_fold) <= np.pi / 4.0 + 1e-12))
+        # At exactly +/-45 degrees either fold is valid, so compare the cosines the range depends on
+        np.testing.assert_allclose(np.cos(az_fold), np.cos(az_adj), atol=1e-12)
+        np.testing.assert_allclose(_expected_cube_range(az, 10.0), 10.0 / (2.0 * np.cos(az_adj)), rtol=1e-12)
+
     async def test_rtx_rotary_lidar_point_cloud(self):
         VisualCuboid(prim_path="/World/cube1", position=np.array([5, 0, 0]), scale=np.array([1, 20, 1]))
         VisualCuboid(prim_path="/World/cube2", position=np.array([-5, 0, 0]), scale=np.array([1, 20, 1]))
@@ -123,12 +279,9 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
         """
         Tests RTX lidar point cloud returns correct range for all azimuth/elevation pairs across multiple frames.
         """
-        from math import floor
-
         # Create a cube of specified edge length
         edge_length = 10.0
         VisualCuboid(prim_path="/World/cube", position=np.array([0, 0, 0]), scale=edge_length * np.ones(3))
-        await update_stage_async()
 
         # Place RTX lidar in the cube, automatically creating point cloud and flat scan annotators
         sensor = self.create_lidar()
@@ -139,20 +292,23 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
             await omni.kit.app.get_app().next_update_async()
 
             frame = sensor.get_current_frame()
-            num_points = len(frame["range"])
-            self.assertEqual(num_points, len(frame["elevation"]))
-            self.assertEqual(num_points, len(frame["azimuth"]))
-
-            for p in range(num_points):
-                az = frame["azimuth"][p]
-                el = frame["elevation"][p]
-                r = frame["range"][p]
-
-                # Adjust azimuth to appropriate angle in [-45, 45], then compute expected range to face, edge, or corner of cube
-                az_adj = az + (1 - floor((3 * np.pi / 4.0 + az) / (np.pi / 2.0))) * np.pi / 2.0
-                range_expected = edge_length / (2.0 * np.cos(az_adj) * np.cos(el))
-
-                self.assertAlmostEqual(r, range_expected, delta=range_expected * 1e-2)
+            r = _asarray(frame["range"])
+            el = _asarray(frame["elevation"])
+            az = _asarray(frame["azimuth"])
+            num_points = len(r)
+            self.assertEqual(num_points, len(el))
+            self.assertEqual(num_points, len(az))
+
+            # Each channel of a rotary lidar has a fixed elevation, so the returns form a channel x firing range image
+            img = _as_range_image(frame, np.unique(el).size)
+            if img is not None and np.all(img["elevation"] == img["elevation"][:, :1]):
+                # The image only exists when the returns fill whole columns, so it holds every return and no padding
+                self.assertEqual(img["range"].size, num_points)
+                # cos(el) once per channel, broadcast across the columns
+                cos_el = np.cos(img["elevation"][:, :1])
+                _validate_cube_ranges(img["range"], img["azimuth"], edge_length, cos_el=cos_el)
+            else:
+                _validate_cube_ranges(r, az, edge_length, cos_el=np.cos(el))
 
         omni.timeline.get_timeline_interface().stop()
 
@@ -161,43 +317,33 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
         Tests all RTX lidar point clouds returns correct range for all azimuth/elevation pairs across multiple frames, when
         multiple RTX lidars are in the scene.
         """
-        from math import floor
-
         position_a = [0, 0, 0]
         position_b = [100.0, 0, 0]
 
         # Create two distant cubes with different edge lengths
         edge_length_a = 10.0
         VisualCuboid(prim_path="/World/cube_a", position=np.array(position_a), scale=edge_length_a * np.ones(3))
-        await update_stage_async()
         edge_length_b = 20.0
         VisualCuboid(prim_path="/World/cube_b", position=np.array(position_b), scale=edge_length_b * np.ones(3))
-        await update_stage_async()
 
         # Place RTX lidar in center of each cube, automatically creating point cloud and flat scan annotators
         sensor_a = self.create_lidar(prim_path="/sensor_a", position=position_a)
-        await update_stage_async()
         sensor_b = self.create_lidar(prim_path="/sensor_b", position=position_b)
+        # All prims are authored above, so a single stage update picks them all up
         await update_stage_async()
 
         omni.timeline.get_timeline_interface().play()
 
         def test_sensor_frame(sensor, edge_length):
             frame = sensor.get_current_frame()
-            num_points = len(frame["range"])
-            self.assertEqual(num_points, len(frame["elevation"]))
-            self.assertEqual(num_points, len(frame["azimuth"]))
-
-            for p in range(num_points):
-                az = frame["azimuth"][p]
-                el = frame["elevation"][p]
-                r = frame["range"][p]
-
-                # Adjust azimuth to appropriate angle in [-45, 45], then compute expected range to face, edge, or corner of cube
-                az_adj = az + (1 - floor((3 * np.pi / 4.0 + az) / (np.pi / 2.0))) * np.pi / 2.0
-                range_expected = edge_length / (2.0 * np.cos(az_adj) * np.cos(el))
+            r = _asarray(frame["range"])
+            el = _asarray(frame["elevation"])
+            az = _asarray(frame["azimuth"])
+            num_points = len(r)
+            self.assertEqual(num_points, len(el))
+            self.assertEqual(num_points, len(az))
 
-                self.assertAlmostEqual(r, range_expected, delta=range_expected * 1e-2)
+            _validate_cube_ranges(r, az, edge_length, cos_el=np.cos(el))
 
         for _ in range(6):
             await omni.kit.app.get_app().next_update_async()
@@ -213,8 +359,6 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
         """
         Tests RTX lidar flat scan returns correct range for all azimuth/elevation pairs across multiple frames.
         """
-        from math import floor
-
         # Create a cube of specified edge length
         edge_length = 10.0
         VisualCuboid(prim_path="/World/cube", position=np.array([0, 0, 0]), scale=edge_length * np.ones(3))
@@ -237,19 +381,12 @@ class TestRTXRotaryLidar(omni.kit.test.AsyncTestCase):
         self.assertAlmostEqual(max_azimuth, 179.9, delta=1e-5)
         self.assertAlmostEqual(horizontal_resolution, 0.1)
 
-        for p in range(len(linear_depth_data)):
-            depth = linear_depth_data[p]
-            if depth < 0.0:
-                continue
-            az = np.deg2rad(min_azimuth + horizontal_resolution * p)
-
-            # Adjust azimuth to appropriate angle in [-45, 45], then compute expected range to face, edge, or corner of cube
-            # Note flat scan projects scan at minimum elevation angle (in this case, -0.32 deg) vertically up along
-            # cube face, so we don't need to account for elevation angle when computing expected range.
-            az_adj = az + (1 - floor((3 * np.pi / 4.0 + az) / (np.pi / 2.0))) * np.pi / 2.0
-            range_expected = edge_length / (2.0 * np.cos(az_adj))
+        depth = np.asarray(linear_depth_data)
+        az = np.deg2rad(min_azimuth + horizontal_resolution * np.arange(len(depth)))
 
-            self.assertAlmostEqual(depth, range_expected, delta=range_expected * 1e-2)
+        # Note flat scan projects scan at minimum elevation angle (in this case, -0.32 deg) vertically up along
+        # cube face, so we don't need to account for elevation angle when computing expected range.
+        _validate_cube_ranges(depth, az, edge_length, mask=depth >= 0.0)
 
         omni.timeline.get_timeline_interface().stop()
 
@@ -11,8 +11,6 @@
 #   omni.kit.test - std python's unittest module with additional wrapping to add suport for async/await tests
 #   For most things refer to unittest docs: https://docs.python.org/3/library/unittest.html
 
-import asyncio
-
 import carb
 import carb.tokens
 import isaacsim.core.utils.numpy.rotations as rot_utils
@@ -52,7 +50,7 @@ class TestRTXSolidStateLidar(omni.kit.test.AsyncTestCase):
         await update_stage_async()
         while omni.usd.get_context().get_stage_loading_status()[2] > 0:
             # print("tearDown, assets still loading, waiting to finish...")
-            await asyncio.sleep(1.0)
+            await omni.kit.app.get_app().next_update_async()
         await update_stage_async()
 
         self._settings = None
@@ -113,14 +111,18 @@ class TestRTXSolidStateLidar(omni.kit.test.AsyncTestCase):
             await update_stage_async()
 
             frame = sensor.get_current_frame()
-            num_points = len(frame["range"])
-            self.assertEqual(num_points, len(frame["elevation"]))
-            self.assertEqual(num_points, len(frame["azimuth"]))
+            # Pull the arrays out of the frame once, rather than looking each one up per point
+            az_arr = frame["azimuth"]
+            el_arr = frame["elevation"]
+            r_arr = frame["range"]
+            num_points = len(r_arr)
+            self.assertEqual(num_points, len(el_arr))
+            self.assertEqual(num_points, len(az_arr))
 
             for p in range(num_points):
-                az = frame["azimuth"][p]
-                el = frame["elevation"][p]
-                r = frame["range"][p]
+                az = az_arr[p]
+                el = el_arr[p]
+                r = r_arr[p]
 
                 # Adjust azimuth to appropriate angle in [-45, 45], then compute expected range to face, edge, or corner of cube
                 az_adj = az + (1 - floor((3 * np.pi / 4.0 + az) / (np.pi / 2.0))) * np.pi / 2.0
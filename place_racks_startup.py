@@ -1,6 +1,16 @@
-import json
 import yaml
 import os
+import numpy as np
+try:
+    # Prefer the libyaml C bindings, fall back to the pure-Python loader if libyaml isn't built.
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+try:
+    # orjson parses straight from bytes in C, fall back to the stdlib json module if it isn't installed.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from isaacsim import SimulationApp
 
 # Path to the config file from which all paths are read
@@ -9,19 +19,27 @@ yaml_config_path = "./place_racks.yaml"
 # Read YAML configuration
 print(f"[RACK PLACER] Reading YAML config: {yaml_config_path}")
 with open(yaml_config_path, 'r') as f:
-    config = yaml.safe_load(f)
+    config = yaml.load(f, Loader=SafeLoader)
 
 # Get JSON file path from YAML
 json_file_path = config.get("json_file_path", "")
 
 # Read JSON to determine warehouse type
 print(f"[RACK PLACER] Reading JSON: {json_file_path}")
-with open(json_file_path, 'r') as f:
-    data = json.load(f)
+with open(json_file_path, 'rb') as f:
+    data = json_loads(f.read())
 
 warehouse_type = data.get("warehouse_type","small").lower()
 scale = data["scale"]
 racks = data["racks"]
+if not isinstance(racks, list):
+    raise ValueError(f"Expected 'racks' to be a list in {json_file_path}, got {type(racks).__name__}")
+# Pull the placement fields out of the rack dicts once, so placement reads contiguous arrays instead of dict lookups.
+# A rack without a rotation is unrotated, as in the layout designer's Rack.from_dict
+racks_np = np.array(
+    [(rack["x"], rack["y"], rack.get("rotation", 0.0)) for rack in racks],
+    dtype=[("x", "f8"), ("y", "f8"), ("rotation", "f8")],
+)
 
 # Determine warehouse USD file based on warehouse type
 warehouse_usd_file = config["warehouse_usd_file"].get(warehouse_type, "")
@@ -33,6 +51,10 @@ rack_asset_file = config["rack_asset_file"].get("narrow_standard", "")
 if not rack_asset_file or rack_asset_file == "default path":
     raise ValueError(f"No valid rack asset file path found")
 
+# Place racks as individual referenced Racks/Rack_NNN prims (default), or as instances of a single UsdGeom.PointInstancer.
+# The instancer changes the scene structure: there are no per-rack prims for anything downstream to look up
+use_point_instancer = bool(config.get("use_point_instancer", False))
+
 # Get human and robot scene path from YAML
 human_and_robot_path = config.get("human_and_robot_path", "")
 if not human_and_robot_path:
@@ -51,13 +73,33 @@ simulation_app = SimulationApp({
 })
 
 import isaacsim.core.utils.prims as prim_utils
-from pxr import Gf, UsdGeom, UsdPhysics, Usd, Sdf
+from pxr import Gf, UsdGeom, UsdPhysics, Usd, Sdf, Vt
 import omni.usd
 import carb
+import carb.profiler
+import carb.settings
 import time
+from contextlib import contextmanager
+
+# Rate-limit Kit's main run loop from the start, so no update loop in this script ever spins uncapped
+idle_rate_hz = 30
+settings = carb.settings.get_settings()
+settings.set_bool("/app/runLoops/main/rateLimitEnabled", True)
+settings.set_int("/app/runLoops/main/rateLimitFrequency", idle_rate_hz)
 
 environment_prim_path = "/World"
 
+
+@contextmanager
+def profile_zone(name):
+    """Record the enclosed block as a named carb.profiler zone (visible in Tracy when a profiler backend is enabled)."""
+    carb.profiler.begin(1, name)
+    try:
+        yield
+    finally:
+        carb.profiler.end(1)
+
+
 print("[RACK PLACER] Starting...")
 
 # Open warehouse
@@ -70,6 +112,9 @@ time.sleep(1)
 
 print(f"[RACK PLACER] Placing {len(racks)} racks...")
 
+# Placement and scene import need their update() calls to return as fast as possible, so lift the cap until they're done
+settings.set_bool("/app/runLoops/main/rateLimitEnabled", False)
+
 # Create racks parent
 racks_parent_path = f"{environment_prim_path}/Racks"
 if not prim_utils.get_prim_at_path(environment_prim_path):
@@ -77,44 +122,101 @@ if not prim_utils.get_prim_at_path(environment_prim_path):
 if not prim_utils.get_prim_at_path(racks_parent_path):
     prim_utils.create_prim(racks_parent_path, "Xform")
 
-# Place each rack
 successful = 0
-for i, rack in enumerate(racks):
-    x_m = rack["x"]
-    y_m = rack["y"] 
-    rack_path = f"{racks_parent_path}/Rack_{i:03d}"
-    
+if use_point_instancer:
+    # Place all racks as instances of one PointInstancer: one prototype referencing the rack asset,
+    # and a single write of the positions/orientations arrays instead of one reference + update per rack
+    stage = omni.usd.get_context().get_stage()
+    instancer_path = f"{racks_parent_path}/RackInstancer"
     try:
-        omni.kit.commands.execute('CreateReference',
-            usd_context=omni.usd.get_context(),
-            path_to=rack_path,
-            asset_path=rack_asset_file,
-            instanceable=True
-        )
-        
-        simulation_app.update()
-        
-        rack_prim = prim_utils.get_prim_at_path(rack_path)
-        if rack_prim:
-            xformable = UsdGeom.Xformable(rack_prim)
-            xformable.AddTranslateOp().Set(Gf.Vec3d(x_m, y_m, 0.0))
-            
-            if rack["rotation"] != 0:
-                xformable.AddRotateZOp().Set(rack["rotation"])
-            
-            # xformable.AddScaleOp().Set(Gf.Vec3f(
-            #     rack["width_m"], 
-            #     rack["depth_m"], 
-            #     1.0
-            # ))
-            
-            successful += 1
-            print(f"[RACK PLACER] ✓ Placed Rack_{i:03d} at ({x_m:.2f}, {y_m:.2f})")
+        instancer = UsdGeom.PointInstancer.Define(stage, instancer_path)
+        prototype_prim = stage.DefinePrim(f"{instancer_path}/Prototypes/Rack", "Xform")
+        prototype_prim.GetReferences().AddReference(rack_asset_file)
+        prototype_prim.SetInstanceable(True)
+        instancer.CreatePrototypesRel().SetTargets([prototype_prim.GetPath()])
+
+        num_racks = len(racks_np)
+        positions = np.zeros((num_racks, 3), dtype=np.float32)
+        positions[:, 0] = racks_np["x"]
+        positions[:, 1] = racks_np["y"]
+        # Rack rotations are degrees about Z, as with the RotateZ op used for individually placed racks
+        half_angles = np.deg2rad(racks_np["rotation"]) / 2.0
+        with profile_zone("rack.instancer_attrs"):
+            instancer.CreatePositionsAttr().Set(Vt.Vec3fArray.FromNumpy(positions))
+            instancer.CreateOrientationsAttr().Set(
+                Vt.QuathArray([Gf.Quath(float(np.cos(h)), 0.0, 0.0, float(np.sin(h))) for h in half_angles])
+            )
+            instancer.CreateProtoIndicesAttr().Set(Vt.IntArray.FromNumpy(np.zeros(num_racks, dtype=np.int32)))
+        with profile_zone("rack.update"):
+            simulation_app.update()
+
+        # Only count the racks as placed once the prototype's rack asset resolves and the instancer reads back
+        # every position; the instancer is one prim, so a per-rack count would otherwise report success unchecked
+        prototype_ok = prototype_prim.IsValid() and Sdf.Layer.FindOrOpen(rack_asset_file) is not None
+        placed_positions = instancer.GetPositionsAttr().Get()
+        num_placed = len(placed_positions) if placed_positions is not None else 0
+        if prototype_ok and num_placed == num_racks:
+            successful = num_racks
+            print(f"[RACK PLACER] ✓ Placed {num_racks} racks as instances of {instancer_path}")
+        elif not prototype_ok:
+            print(f"[RACK PLACER] ✗ Rack prototype {prototype_prim.GetPath()} could not resolve {rack_asset_file}")
         else:
-            print(f"[RACK PLACER] ✗ Failed to get prim for Rack_{i:03d}")
-    
+            print(f"[RACK PLACER] ✗ Rack PointInstancer {instancer_path} has {num_placed}/{num_racks} positions")
     except Exception as e:
-        print(f"[RACK PLACER] ✗ Error with Rack_{i:03d}: {e}")
+        print(f"[RACK PLACER] ✗ Error creating rack PointInstancer: {e}")
+else:
+    # Resolve the context and the functions called per rack once, instead of walking the module attributes every iteration
+    usd_ctx = omni.usd.get_context()
+    app_update = simulation_app.update
+    get_prim = prim_utils.get_prim_at_path
+    exec_cmd = omni.kit.commands.execute
+
+    # Reference every rack first, then flush once: the prims have to exist on the stage before their xforms are authored
+    referenced = []
+    for i, (x_m, y_m, rotation) in enumerate(racks_np.tolist()):
+        rack_path = f"{racks_parent_path}/Rack_{i:03d}"
+    
+        try:
+            with profile_zone("rack.create_reference"):
+                exec_cmd('CreateReference',
+                    usd_context=usd_ctx,
+                    path_to=rack_path,
+                    asset_path=rack_asset_file,
+                    instanceable=True
+                )
+            referenced.append((i, rack_path, x_m, y_m, rotation))
+    
+        except Exception as e:
+            print(f"[RACK PLACER] ✗ Error with Rack_{i:03d}: {e}")
+
+    with profile_zone("rack.update"):
+        app_update()
+
+    # Then author each referenced rack's translate and rotate ops
+    with profile_zone("rack.xform_ops"):
+        for i, rack_path, x_m, y_m, rotation in referenced:
+            try:
+                rack_prim = get_prim(rack_path)
+                if rack_prim:
+                    xformable = UsdGeom.Xformable(rack_prim)
+                    xformable.AddTranslateOp().Set(Gf.Vec3d(x_m, y_m, 0.0))
+
+                    if rotation != 0:
+                        xformable.AddRotateZOp().Set(rotation)
+                
+                    # xformable.AddScaleOp().Set(Gf.Vec3f(
+                    #     rack["width_m"], 
+                    #     rack["depth_m"], 
+                    #     1.0
+                    # ))
+                
+                    successful += 1
+                    print(f"[RACK PLACER] ✓ Placed Rack_{i:03d} at ({x_m:.2f}, {y_m:.2f})")
+                else:
+                    print(f"[RACK PLACER] ✗ Failed to get prim for Rack_{i:03d}")
+    
+            except Exception as e:
+                print(f"[RACK PLACER] ✗ Error with Rack_{i:03d}: {e}")
 
 print(f"[RACK PLACER] Complete! Placed {successful}/{len(racks)} racks.")
 
@@ -164,6 +266,10 @@ except Exception as e:
 
 # Keep the simulation running (remove these lines if you want it to exit immediately)
 print("[RACK PLACER] Simulation running. Close window to exit.")
+# Cap the idle loop instead of spinning update() as fast as possible: Kit's rate limit on its main run loop
+# paces each update() to idle_rate_hz
+settings.set_int("/app/runLoops/main/rateLimitFrequency", idle_rate_hz)
+settings.set_bool("/app/runLoops/main/rateLimitEnabled", True)
 while simulation_app.is_running():
     simulation_app.update()
 
@@ -4,77 +4,90 @@ Script to add/update custom_path variable in get_default_config_file_path() func
 Usage: python replace_config_path.py /path/to/config/file
 """
 import sys
-import re
+import ast
 import argparse
+import itertools
 from pathlib import Path
 
 TARGET_FILE = "/home/hitesh/isaacsim/extscache/isaacsim.replicator.agent.core-0.5.14+106.5.0/isaacsim/replicator/agent/core/config_file/util.py"
 
+def _function_statements(func):
+    """Yield the statements of func's body, without descending into nested functions or classes."""
+    stack = list(func.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        yield node
+        stack.extend(child for child in ast.iter_child_nodes(node) if isinstance(child, ast.stmt))
+
+
 def update_path_in_function(file_path, new_config_path):
     """Add or update custom_path variable in get_default_config_file_path() function."""
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    inside_function = False
-    indent_level = None
-    updated_lines = []
-    custom_path_exists = False
-    custom_path_updated = False
-    return_statement_found = False
-    function_body_start_index = None
-    
-    for i, line in enumerate(lines):
-        # Check if we're entering the target function
-        if re.match(r'^\s*def\s+get_default_config_file_path\s*\(', line):
-            inside_function = True
-            indent_level = len(line) - len(line.lstrip())
-            function_body_start_index = len(updated_lines) + 1
-            updated_lines.append(line)
-            continue
-        
-        # If we're inside the function
-        if inside_function:
-            current_indent = len(line) - len(line.lstrip())
-            
-            # Check if we've exited the function (dedent or new def/class)
-            if line.strip() and current_indent <= indent_level and not line.strip().startswith('#'):
-                inside_function = False
-            
-            # Look for existing custom_path variable
-            if inside_function and re.match(r'^\s*custom_path\s*=', line):
-                custom_path_exists = True
-                custom_path_updated = True
-                indent = ' ' * current_indent
-                updated_lines.append(f'{indent}custom_path = "{new_config_path}"\n')
-                #print(f"✓ Updated existing custom_path to: {new_config_path}")
-                continue
-            
-            # Look for return statement to potentially modify it
-            if inside_function and re.match(r'^\s*return\s+', line):
-                return_statement_found = True
-                
-                # If custom_path doesn't exist yet, add it before the return
-                if not custom_path_exists:
-                    indent = ' ' * current_indent
-                    updated_lines.append(f'{indent}custom_path = "{new_config_path}"\n')
-                    custom_path_exists = True
-                    custom_path_updated = True
-                    #print(f"✓ Added custom_path variable: {new_config_path}")
-                
-                # Modify return statement to return custom_path
-                indent = ' ' * current_indent
-                updated_lines.append(f'{indent}return custom_path\n')
-                #print(f"Updated return statement to return custom_path")
-                continue
-        
-        updated_lines.append(line)
-    
-    if not custom_path_updated:
+    # Read the file in one go as bytes: ast column offsets are UTF-8 byte offsets, so edits can index the bytes directly.
+    src = Path(file_path).read_bytes()
+
+    # Parse once to locate the function and its custom_path assignments / return statements,
+    # then edit only those source spans so the rest of the file keeps its formatting and comments.
+    tree = ast.parse(src)
+    # Byte offset at which each line starts, to turn (lineno, col_offset) positions into offsets into src
+    line_starts = list(itertools.accumulate(map(len, src.splitlines(keepends=True)), initial=0))
+    func = next(
+        (node for node in ast.walk(tree)
+         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "get_default_config_file_path"),
+        None,
+    )
+    if func is None:
         print("Warning: Could not find or update custom_path in the function")
-    
+        return
+
+    assignment = f'custom_path = "{new_config_path}"'
+    custom_path_assigns = []
+    returns = []
+    for node in _function_statements(func):
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "custom_path" for t in node.targets):
+            custom_path_assigns.append(node)
+        elif isinstance(node, ast.Return):
+            returns.append(node)
+
+    # Each edit replaces the source span (line, col)-(end_line, end_col) with new text; insertions are empty spans.
+    edits = [(node.lineno, node.col_offset, node.end_lineno, node.end_col_offset, assignment) for node in custom_path_assigns]
+    edits += [(node.lineno, node.col_offset, node.end_lineno, node.end_col_offset, "return custom_path") for node in returns]
+    if not custom_path_assigns and returns:
+        # If custom_path doesn't exist yet, add it before the first return when that return is directly in the
+        # function body; otherwise other paths could reach a return before it, so add it at the top of the body.
+        first_return = min(returns, key=lambda node: (node.lineno, node.col_offset))
+        if first_return in func.body:
+            anchor = first_return
+        else:
+            has_docstring = isinstance(func.body[0], ast.Expr) and isinstance(func.body[0].value, ast.Constant) \
+                and isinstance(func.body[0].value.value, str)
+            anchor = func.body[1 if has_docstring else 0]
+        prefix = src[line_starts[anchor.lineno - 1]:line_starts[anchor.lineno - 1] + anchor.col_offset].decode()
+        if prefix.strip():
+            # The statement shares its line with other code (e.g. `if x: return y`), so chain the assignment inline
+            new_text = f"{assignment}; "
+        else:
+            new_text = f"{assignment}\n{prefix}"
+        edits.append((anchor.lineno, anchor.col_offset, anchor.lineno, anchor.col_offset, new_text))
+
+    if not edits:
+        print("Warning: Could not find or update custom_path in the function")
+        return
+
+    # Stitch the untouched stretches of src and the replacement texts together in file order
+    pieces = []
+    pos = 0
+    for line, col, end_line, end_col, text in sorted(edits, key=lambda e: (e[0], e[1], e[2], e[3])):
+        start = line_starts[line - 1] + col
+        pieces.append(src[pos:start])
+        pieces.append(text.encode())
+        pos = line_starts[end_line - 1] + end_col
+    pieces.append(src[pos:])
+
     # Write updated content
-    with open(file_path, 'w') as f:
-        f.writelines(updated_lines)
+    Path(file_path).write_bytes(b"".join(pieces))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -8,14 +8,281 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
 import math
-from PIL import Image, ImageDraw
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+from PIL import Image, ImageDraw, ImageTk
+try:
+    # orjson parses and serializes in native code; fall back to the stdlib json module if it isn't installed
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import numba
+except ImportError:
+    # numba is optional, without it rack positions are always generated with plain NumPy
+    numba = None
+
+
+# Warehouse presets (width, height in meters), read-only and shared by every designer window
+_WAREHOUSE_PRESETS = MappingProxyType({
+    "Small": (30, 20),
+    "Big": (54, 32),
+    "Factory": (60, 34),
+    "Custom": (40, 30)
+})
+
+# Preset rack dimensions (width, depth in meters)
+_RACK_PRESETS = MappingProxyType({
+    "SmallRack": (2.0, 0.96),
+    "Custom": (1.0, 1.0)
+})
+
+
+def _json_default(obj):
+    """Serialize values JSON doesn't know natively (e.g. NumPy scalars/arrays) via their Python equivalents"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _loads(data):
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj):
+    """Serialize obj to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, default=_json_default).encode()
+
+
+def _write_text(path, text):
+    """Write text to path, replacing its contents"""
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+@lru_cache(maxsize=32)
+def _parsed_preset(path, mtime_ns):
+    """Parse a preset file, cached per (path, modification time) so unchanged presets reload without disk I/O.
+
+    The returned data is shared between callers and must be treated as read-only.
+    """
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+
+@lru_cache(maxsize=4)
+def _grid_lines_image(xs, ys, width, height):
+    """Transparent width x height image of the grid lines at pixel offsets xs (vertical) and ys (horizontal).
+
+    Keyed on the offsets relative to the image, so viewports showing the same line pattern share one image.
+    """
+    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for x in xs:
+        draw.line([(x, 0), (x, height)], fill='lightgray', width=1)
+    for y in ys:
+        draw.line([(0, y), (width, y)], fill='lightgray', width=1)
+    return img
+
+
+def _in_bounds(positions, w_px, h_px):
+    """Rows of an (N, 2) array of canvas positions that lie inside the warehouse"""
+    x = positions[:, 0]
+    y = positions[:, 1]
+    return positions[(0 <= x) & (x <= w_px) & (0 <= y) & (y <= h_px)]
+
+
+def _row_positions_np(x1, y1, ux, uy, step_px, count, w_px, h_px):
+    i = np.arange(count)
+    return _in_bounds(np.stack([x1 + ux * step_px * i, y1 + uy * step_px * i], axis=1), w_px, h_px)
+
+
+def _grid_positions_np(x, y, cols, rows, spacing_px, row_spacing_px, w_px, h_px):
+    rx = x + np.arange(cols) * spacing_px
+    ry = y + np.arange(rows) * row_spacing_px
+    # Row-major, like placing the racks row by row
+    return _in_bounds(np.stack(np.meshgrid(rx, ry), axis=-1).reshape(-1, 2), w_px, h_px)
+
+
+# Below this many racks the NumPy versions are as fast, and the first call doesn't wait for numba to compile
+_NUMBA_MIN_RACKS = 10000
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _row_positions_nb(x1, y1, ux, uy, step_px, count, w_px, h_px):
+        out = np.empty((count, 2), dtype=np.float64)
+        n = 0
+        for i in range(count):
+            rx = x1 + ux * step_px * i
+            ry = y1 + uy * step_px * i
+            if 0 <= rx <= w_px and 0 <= ry <= h_px:
+                out[n, 0] = rx
+                out[n, 1] = ry
+                n += 1
+        return out[:n]
+
+    @numba.njit(cache=True)
+    def _grid_positions_nb(x, y, cols, rows, spacing_px, row_spacing_px, w_px, h_px):
+        out = np.empty((rows * cols, 2), dtype=np.float64)
+        n = 0
+        for row in range(rows):
+            ry = y + row * row_spacing_px
+            for col in range(cols):
+                rx = x + col * spacing_px
+                if 0 <= rx <= w_px and 0 <= ry <= h_px:
+                    out[n, 0] = rx
+                    out[n, 1] = ry
+                    n += 1
+        return out[:n]
+
+
+def _row_positions(x1, y1, ux, uy, step_px, count, w_px, h_px):
+    """(N, 2) canvas positions of the racks of a row that fall inside the warehouse, in placement order"""
+    if numba is not None and count >= _NUMBA_MIN_RACKS:
+        return _row_positions_nb(x1, y1, ux, uy, step_px, count, w_px, h_px)
+    return _row_positions_np(x1, y1, ux, uy, step_px, count, w_px, h_px)
+
+
+def _grid_positions(x, y, cols, rows, spacing_px, row_spacing_px, w_px, h_px):
+    """(N, 2) canvas positions of the racks of a grid that fall inside the warehouse, row by row"""
+    if numba is not None and rows * cols >= _NUMBA_MIN_RACKS:
+        return _grid_positions_nb(x, y, cols, rows, spacing_px, row_spacing_px, w_px, h_px)
+    return _grid_positions_np(x, y, cols, rows, spacing_px, row_spacing_px, w_px, h_px)
+
+
+# 'lightgray' as an RGB triple, for the grid lines written straight into image arrays
+_LIGHTGRAY = (211, 211, 211)
+
+
+@lru_cache(maxsize=1)
+def _png_background(scale, warehouse_width_m, warehouse_height_m, origin_x_m, origin_y_m):
+    """PNG export background: grid, warehouse boundary and origin marker.
+
+    Cached for the last warehouse exported; callers draw on a copy() and must not modify the returned image.
+    """
+    # Get canvas dimensions
+    width = int(warehouse_width_m * scale)
+    height = int(warehouse_height_m * scale)
+    
+    # Create image with the grid already in it: the meter lines are written as whole pixel columns/rows
+    # of one array (at the truncated positions PIL's draw.line would use), instead of one draw call per line
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    xs = (np.arange(int(warehouse_width_m) + 1) * scale).astype(int)
+    ys = (np.arange(int(warehouse_height_m) + 1) * scale).astype(int)
+    pixels[:, xs[xs < width]] = _LIGHTGRAY
+    pixels[ys[ys < height], :] = _LIGHTGRAY
+    
+    # Draw boundary: a 3 pixel black border, as slice writes on the same array
+    pixels[:3] = 0
+    pixels[-3:] = 0
+    pixels[:, :3] = 0
+    pixels[:, -3:] = 0
+    image = Image.fromarray(pixels, 'RGB')
+    draw = ImageDraw.Draw(image)
+    
+    # Draw origin
+    ox = int(origin_x_m * scale)
+    oy = int(origin_y_m * scale)
+    size = 20
+    draw.line([(ox - size, oy), (ox + size, oy)], fill='blue', width=2)
+    draw.line([(ox, oy - size), (ox, oy + size)], fill='blue', width=2)
+    draw.ellipse([ox-5, oy-5, ox+5, oy+5], fill='blue', outline='darkblue')
+    return image
+
+
+# Signs of the corner offsets from a rack's center, in drawing order
+_CORNER_SIGNS = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float64)
+
+
+@lru_cache(maxsize=512)
+def _rotation_cos_sin(rotation):
+    """(cos, sin) of a rotation in degrees; layouts use a handful of distinct rotations, so these are nearly always hits"""
+    angle_rad = np.deg2rad(rotation)
+    return float(np.cos(angle_rad)), float(np.sin(angle_rad))
+
+
+def _rack_corners(xy, wd, rot, scale, cos_sin=None):
+    """(N, 4, 2) array of the rotated corners of N racks, in canvas pixels.
+
+    xy are the rack centers in canvas pixels, wd the (width, depth) in meters and rot the rotations in degrees.
+    cos_sin can pass in the (cos, sin) of a single rotation shared by all N racks, instead of computing it from rot.
+    """
+    # Corner points (unrotated, relative to the center) of every rack at once
+    half = np.asarray(wd, dtype=np.float64) * scale / 2
+    corners = _CORNER_SIGNS * half[:, None, :]
+    cx = corners[..., 0]
+    cy = corners[..., 1]
+    
+    if cos_sin is None:
+        angle_rad = np.deg2rad(rot)[:, None]
+        cos_a = np.cos(angle_rad)
+        sin_a = np.sin(angle_rad)
+    else:
+        cos_a, sin_a = cos_sin
+    
+    rotated = np.empty_like(corners)
+    rotated[..., 0] = cx * cos_a - cy * sin_a + xy[:, 0:1]
+    rotated[..., 1] = cx * sin_a + cy * cos_a + xy[:, 1:2]
+    return rotated
+
+
+class _StoreField:
+    """Numeric rack attribute, kept in the owning RackStore's arrays once the rack has been added to one"""
+    def __init__(self, array, column=None):
+        self.array = array
+        self.column = column
+    
+    def __set_name__(self, owner, name):
+        self.local = '_' + name
+    
+    def __get__(self, rack, owner=None):
+        if rack is None:
+            return self
+        if rack._store is None:
+            return getattr(rack, self.local)
+        values = getattr(rack._store, self.array)
+        if self.column is None:
+            return values[rack._idx].item()
+        return values[rack._idx, self.column].item()
+    
+    def __set__(self, rack, value):
+        if rack._store is None:
+            setattr(rack, self.local, value)
+            return
+        if self.array == 'xy':
+            rack._store._cells = None  # The rack moved, so the store's cell index is stale
+        if self.column is None:
+            getattr(rack._store, self.array)[rack._idx] = value
+        else:
+            getattr(rack._store, self.array)[rack._idx, self.column] = value
+
 
 class Rack:
     """Represents a single rack with position and dimensions"""
+    x = _StoreField('xy', 0)  # Canvas coordinates
+    y = _StoreField('xy', 1)
+    width_m = _StoreField('wd', 0)  # Real-world meters
+    depth_m = _StoreField('wd', 1)
+    rotation = _StoreField('rot')
+    # No per-instance __dict__: the _StoreField values live in these slots until the rack joins a RackStore
+    __slots__ = ('_store', '_idx', '_x', '_y', '_width_m', '_depth_m', '_rotation', 'rack_type', 'canvas_id')
+    
     def __init__(self, x, y, width_m, depth_m, rotation=0, rack_type="SmallRack"):
-        self.x = x  # Canvas coordinates
+        self._store = None
+        self._idx = None
+        self.x = x
         self.y = y
-        self.width_m = width_m  # Real-world meters
+        self.width_m = width_m
         self.depth_m = depth_m
         self.rotation = rotation
         self.rack_type = rack_type
@@ -59,6 +326,184 @@ class Rack:
                    data['depth_m'], data.get('rotation', 0),
                    data.get('type', 'SmallRack'))
 
+    @staticmethod
+    def from_dicts(racks_data, origin_x_m, origin_y_m, scale):
+        """Create racks from a list of dicts with world coordinates, converting all positions in one pass"""
+        if not racks_data:
+            return []
+        
+        # Swap back: JSON x is canvas y, JSON y is canvas x
+        world = np.array([(data['y'], data['x']) for data in racks_data], dtype=np.float64)
+        
+        # Convert from world coordinates to canvas coordinates for every rack at once
+        canvas_px = (world + (origin_x_m, origin_y_m)) * scale
+        
+        return [Rack(x_px, y_px, data['width_m'],
+                     data['depth_m'], data.get('rotation', 0),
+                     data.get('type', 'SmallRack'))
+                for (x_px, y_px), data in zip(canvas_px.tolist(), racks_data)]
+
+
+class RackStore:
+    """List of racks that stores their numeric fields column-wise in NumPy arrays (SoA).
+    
+    Each Rack added here becomes a view onto its row, so per-rack code keeps using rack.x etc.
+    while bulk operations (rescaling, serialization) work on whole columns at once.
+    """
+    def __init__(self, capacity=16):
+        self._racks = []
+        self._xy = np.empty((capacity, 2), dtype=np.float64)  # Canvas x, y in pixels
+        self._wd = np.empty((capacity, 2), dtype=np.float64)  # Width, depth in meters
+        self._rot = np.empty(capacity, dtype=np.float64)  # Rotation in degrees
+        # Uniform grid over the rack centers for nearest-rack queries: {(cell x, cell y): [rack index, ...]},
+        # built on demand and dropped whenever a rack is added, removed or moved
+        self._cells = None
+        self._cell_size = None
+    
+    @property
+    def xy(self):
+        return self._xy[:len(self._racks)]
+    
+    @xy.setter
+    def xy(self, values):
+        self._xy[:len(self._racks)] = values
+        self._cells = None
+    
+    @property
+    def wd(self):
+        return self._wd[:len(self._racks)]
+    
+    @wd.setter
+    def wd(self, values):
+        self._wd[:len(self._racks)] = values
+    
+    @property
+    def rot(self):
+        return self._rot[:len(self._racks)]
+    
+    @rot.setter
+    def rot(self, values):
+        self._rot[:len(self._racks)] = values
+    
+    def __len__(self):
+        return len(self._racks)
+    
+    def __iter__(self):
+        return iter(self._racks)
+    
+    def __getitem__(self, idx):
+        return self._racks[idx]
+    
+    def _reserve(self, count):
+        """Grow the arrays (doubling) so they can hold count racks"""
+        capacity = len(self._rot)
+        if count <= capacity:
+            return
+        capacity = max(count, 2 * capacity)
+        n = len(self._racks)
+        for name in ('_xy', '_wd', '_rot'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+    
+    def append(self, rack):
+        self.extend((rack,))
+    
+    def extend(self, racks):
+        racks = list(racks)
+        if not racks:
+            return
+        if any(rack._store is not None for rack in racks):
+            raise ValueError("Rack already belongs to a RackStore")
+        
+        n = len(self._racks)
+        end = n + len(racks)
+        self._reserve(end)
+        values = np.array([(rack.x, rack.y, rack.width_m, rack.depth_m, rack.rotation) for rack in racks],
+                          dtype=np.float64)
+        self._xy[n:end] = values[:, 0:2]
+        self._wd[n:end] = values[:, 2:4]
+        self._rot[n:end] = values[:, 4]
+        for idx, rack in enumerate(racks, n):
+            rack._store = self
+            rack._idx = idx
+        self._racks.extend(racks)
+        self._cells = None
+    
+    def _detach(self, rack):
+        """Move a rack's values back onto the rack itself when it leaves the store"""
+        rack._x, rack._y, rack._width_m, rack._depth_m, rack._rotation = (
+            rack.x, rack.y, rack.width_m, rack.depth_m, rack.rotation)
+        rack._store = None
+        rack._idx = None
+    
+    def pop(self, idx=-1):
+        rack = self._racks[idx]
+        idx = rack._idx
+        self._detach(rack)
+        del self._racks[idx]
+        
+        # Close the gap in the arrays and renumber the racks after it
+        n = len(self._racks)
+        self._xy[idx:n] = self._xy[idx + 1:n + 1]
+        self._wd[idx:n] = self._wd[idx + 1:n + 1]
+        self._rot[idx:n] = self._rot[idx + 1:n + 1]
+        for i in range(idx, n):
+            self._racks[i]._idx = i
+        self._cells = None
+        return rack
+    
+    def clear(self):
+        for rack in self._racks:
+            self._detach(rack)
+        self._racks.clear()
+        self._cells = None
+    
+    def first_within(self, x, y, radius):
+        """Index of the first rack whose center is closer than radius to (x, y), or None.
+        
+        Only the racks in the 3x3 grid cells (of size radius) around the point are checked,
+        rather than every rack in the store.
+        """
+        if self._cells is None or self._cell_size != radius:
+            self._cells = {}
+            self._cell_size = radius
+            for idx, cell in enumerate((self.xy // radius).astype(np.int64).tolist()):
+                self._cells.setdefault(tuple(cell), []).append(idx)
+        
+        cx, cy = int(x // radius), int(y // radius)
+        candidates = [idx for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                      for idx in self._cells.get((cx + dx, cy + dy), ())]
+        if not candidates:
+            return None
+        candidates = np.array(candidates)
+        # Squared distances, so no sqrt per candidate
+        d2 = ((self._xy[candidates] - (x, y)) ** 2).sum(axis=1)
+        hits = candidates[d2 < radius ** 2]
+        return int(hits.min()) if len(hits) else None
+    
+    def corners(self, scale):
+        """(N, 4, 2) array of every rack's rotated corners in canvas pixels"""
+        return _rack_corners(self.xy, self.wd, self.rot, scale)
+    
+    def to_dicts(self, origin_x_m, origin_y_m, scale):
+        """Convert all racks to dicts with world coordinates relative to origin, transforming every rack at once"""
+        # Canvas pixels to origin-relative meters
+        world = np.round(self.xy / scale - (origin_x_m, origin_y_m), 3)
+        
+        # Swap x and y for the JSON output
+        return [{
+                    'type': rack.rack_type,
+                    'x': world_y,  # Canvas Y becomes world X
+                    'y': world_x,  # Canvas X becomes world Y
+                    'width_m': width_m,
+                    'depth_m': depth_m,
+                    'rotation': rotation
+                }
+                for rack, (world_x, world_y), (width_m, depth_m), rotation
+                in zip(self._racks, world.tolist(), self.wd.tolist(), self.rot.tolist())]
+
 
 class WarehouseDesigner:
     def __init__(self, root):
@@ -70,12 +515,7 @@ class WarehouseDesigner:
         self.scale = 50  # 50 pixels = 1 meter
         
         # Warehouse presets (width, height in meters)
-        self.warehouse_presets = {
-            "Small": (30, 20),
-            "Big": (54, 32),
-            "Factory": (60, 34),
-            "Custom": (40, 30)
-        }
+        self.warehouse_presets = _WAREHOUSE_PRESETS
         
         # Default warehouse dimensions
         self.warehouse_width_m = 30
@@ -86,25 +526,47 @@ class WarehouseDesigner:
         self.origin_y_m = 10
         
         # Racks storage
-        self.racks = []
+        self.racks = RackStore()
         self.selected_rack = None
         self.selected_rack_idx = None
         
-        # Path waypoints storage
-        self.waypoints = []
+        # Path waypoints storage: canvas x, y rows of a buffer that grows by doubling, exposed as self.waypoints
+        self._wp_buf = np.empty((16, 2), dtype=np.float64)
+        self._wp_len = 0
+        # Canvas ids of the path segments and of the (circle, number) marker pairs, reused across redraws,
+        # and the whole-pixel waypoint positions they were last drawn at
         self.path_lines = []
         self.waypoint_markers = []
+        self._path_drawn = np.empty((0, 2), dtype=int)
+        self._path_redraw_pending = False
         
         # Drawing state
         self.mode = "single"  # single, row, grid, select, path
         self.drag_start = None
         self.temp_line = None
+        self._drag_scheduled = False
+        
+        # Warehouse extent in canvas pixels, refreshed by update_warehouse_size for the mouse handler bounds checks
+        self._canvas_w_px = self.warehouse_width_m * self.scale
+        self._canvas_h_px = self.warehouse_height_m * self.scale
+        
+        # Single worker thread for writing export files, so PNG encoding doesn't block the UI. One worker keeps
+        # the writes in submission order
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        
+        # Nesting depth of _batch_canvas blocks
+        self._batch_depth = 0
+        
+        # Canvas ids of the grid lines and labels, reused across redraws
+        self._grid_image_id = None
+        self._grid_photo = None  # Tk image of the current grid tile; the canvas only renders it while referenced
+        self._grid_photo_src = None
+        self._grid_v_label_ids = []
+        self._grid_h_label_ids = []
+        self._grid_redraw_pending = False
         
         # Preset rack dimensions (in meters)
-        self.rack_presets = {
-            "SmallRack": (2.0, 0.96),
-            "Custom": (1.0, 1.0)
-        }
+        self.rack_presets = _RACK_PRESETS
         
         self.setup_ui()
         self.update_warehouse_size()
@@ -115,19 +577,17 @@ class WarehouseDesigner:
         presets_dir = "presets"
         
         # Check if presets directory exists
-        import os
-        if os.path.exists(presets_dir) and os.path.isdir(presets_dir):
-            # Get all JSON files in presets directory
-            for file in os.listdir(presets_dir):
-                if file.endswith('.json'):
-                    self.preset_files.append(file.replace('.json', ''))
-        
-        # Sort alphabetically
-        self.preset_files.sort()
+        if os.path.isdir(presets_dir):
+            # Get all JSON files in presets directory, sorted alphabetically.
+            # scandir reports each entry's type from the directory listing itself, so no extra stat per file
+            with os.scandir(presets_dir) as entries:
+                self.preset_files = sorted(entry.name[:-5] for entry in entries
+                                           if entry.name.endswith('.json') and entry.is_file())
 
     def refresh_preset_list(self):
         """Refresh the preset list"""
         self.load_preset_list()
+        _parsed_preset.cache_clear()
         self.preset_combo['values'] = self.preset_files
         if self.preset_files:
             self.preset_combo.current(0)
@@ -144,7 +604,6 @@ class WarehouseDesigner:
             messagebox.showwarning("Warning", "Please select a preset")
             return
         
-        import os
         filename = os.path.join("presets", preset_name + ".json")
         
         if not os.path.exists(filename):
@@ -152,49 +611,47 @@ class WarehouseDesigner:
             return
         
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            # Only read from data below: it is the cached parse, shared with later loads of the same file
+            data = _parsed_preset(filename, os.stat(filename).st_mtime_ns)
             
-            # Clear existing
-            self.canvas.delete('all')
-            self.racks.clear()
-            self.waypoints.clear()
-            self.path_lines.clear()
-            self.waypoint_markers.clear()
+            # Rebuild the whole scene with the canvas held, so it repaints once at the end
+            with self._batch_canvas():
+                # Clear existing
+                self._clear_canvas()
+                self.racks.clear()
+                self.waypoints = np.empty((0, 2), dtype=np.float64)
             
-            # Load settings (same as load_layout)
-            self.scale = data.get('scale', 50)
-            self.scale_var.set(str(self.scale))
+                # Load settings (same as load_layout)
+                self.scale = data.get('scale', 50)
+                self.scale_var.set(str(self.scale))
             
-            self.warehouse_width_m = data.get('warehouse_width_m', 40)
-            self.warehouse_height_m = data.get('warehouse_height_m', 30)
-            self.wh_width_var.set(str(self.warehouse_width_m))
-            self.wh_height_var.set(str(self.warehouse_height_m))
+                self.warehouse_width_m = data.get('warehouse_width_m', 40)
+                self.warehouse_height_m = data.get('warehouse_height_m', 30)
+                self.wh_width_var.set(str(self.warehouse_width_m))
+                self.wh_height_var.set(str(self.warehouse_height_m))
             
-            warehouse_type = data.get('warehouse_type', 'Custom')
-            self.warehouse_var.set(warehouse_type)
+                warehouse_type = data.get('warehouse_type', 'Custom')
+                self.warehouse_var.set(warehouse_type)
             
-            origin = data.get('world_origin', {'x': self.warehouse_width_m/2, 
-                                            'y': self.warehouse_height_m/2})
-            self.origin_x_m = origin['x']
-            self.origin_y_m = origin['y']
-            self.origin_x_var.set(str(self.origin_x_m))
-            self.origin_y_var.set(str(self.origin_y_m))
+                origin = data.get('world_origin', {'x': self.warehouse_width_m/2, 
+                                                'y': self.warehouse_height_m/2})
+                self.origin_x_m = origin['x']
+                self.origin_y_m = origin['y']
+                self.origin_x_var.set(str(self.origin_x_m))
+                self.origin_y_var.set(str(self.origin_y_m))
             
-            # Load racks
-            for rack_data in data['racks']:
-                rack = Rack.from_dict(rack_data, self.origin_x_m, 
-                                    self.origin_y_m, self.scale)
-                self.racks.append(rack)
+                # Load racks
+                self.racks.extend(Rack.from_dicts(data['racks'], self.origin_x_m,
+                                                  self.origin_y_m, self.scale))
             
-            # Load path
-            if 'path' in data and 'waypoints' in data['path']:
-                self.waypoints_from_dict(data['path']['waypoints'])
+                # Load path
+                if 'path' in data and 'waypoints' in data['path']:
+                    self.waypoints_from_dict(data['path']['waypoints'])
             
-            self.update_warehouse_size()
-            messagebox.showinfo("Success", f"Preset '{preset_name}' loaded\n"
-                            f"Racks: {len(self.racks)}\n"
-                            f"Waypoints: {len(self.waypoints)}")
+                self.update_warehouse_size()
+            # Routine success: report it in the status bar rather than a blocking dialog
+            self.status_bar.config(text=f"Loaded '{preset_name}': {len(self.racks)} racks, "
+                                        f"{len(self.waypoints)} waypoints")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load preset: {e}")
@@ -258,9 +715,28 @@ class WarehouseDesigner:
         def on_mousewheel(event):
             left_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
             
-        left_canvas.bind_all("<MouseWheel>", on_mousewheel)  # Windows
-        left_canvas.bind_all("<Button-4>", lambda e: left_canvas.yview_scroll(-1, "units"))  # Linux scroll up
-        left_canvas.bind_all("<Button-5>", lambda e: left_canvas.yview_scroll(1, "units"))   # Linux scroll down
+        # Only hold the global wheel bindings while the pointer is over the panel, so the wheel
+        # isn't routed to the panel's scroll handler everywhere else (e.g. over the drawing canvas)
+        def bind_mousewheel(event):
+            left_canvas.bind_all("<MouseWheel>", on_mousewheel)  # Windows
+            left_canvas.bind_all("<Button-4>", lambda e: left_canvas.yview_scroll(-1, "units"))  # Linux scroll up
+            left_canvas.bind_all("<Button-5>", lambda e: left_canvas.yview_scroll(1, "units"))   # Linux scroll down
+        
+        def unbind_mousewheel(event):
+            # Moving onto one of the panel's own widgets also sends <Leave>; keep scrolling in that case
+            try:
+                widget = left_panel_container.winfo_containing(event.x_root, event.y_root)
+            except KeyError:
+                widget = None
+            container = str(left_panel_container)
+            if widget is not None and (str(widget) == container or str(widget).startswith(container + '.')):
+                return
+            left_canvas.unbind_all("<MouseWheel>")
+            left_canvas.unbind_all("<Button-4>")
+            left_canvas.unbind_all("<Button-5>")
+        
+        left_panel_container.bind("<Enter>", bind_mousewheel)
+        left_panel_container.bind("<Leave>", unbind_mousewheel)
         
         # Warehouse size selection
         warehouse_frame = ttk.LabelFrame(left_panel, text="Warehouse Size", padding=10)
@@ -434,9 +910,9 @@ class WarehouseDesigner:
         
         # Scrollbars
         v_scroll = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, 
-                                command=self.canvas.yview)
+                                command=self.scroll_y)
         h_scroll = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL,
-                                command=self.canvas.xview)
+                                command=self.scroll_x)
         
         self.canvas.configure(yscrollcommand=v_scroll.set, 
                             xscrollcommand=h_scroll.set)
@@ -450,6 +926,8 @@ class WarehouseDesigner:
         self.canvas.bind('<B1-Motion>', self.canvas_drag)
         self.canvas.bind('<ButtonRelease-1>', self.canvas_release)
         self.canvas.bind('<Delete>', lambda e: self.delete_selected())
+        # The grid only covers the visible part of the canvas, so redraw it when the viewport changes
+        self.canvas.bind('<Configure>', lambda e: self.schedule_grid_redraw())
         
         # Status bar
         self.status_bar = ttk.Label(self.root, text="Ready", 
@@ -483,59 +961,158 @@ class WarehouseDesigner:
             self.wh_width_var.set(str(self.warehouse_width_m))
             self.wh_height_var.set(str(self.warehouse_height_m))
     
+    @contextmanager
+    def _batch_canvas(self):
+        """Group a bulk redraw so the canvas takes no input while it is rebuilt and repaints once afterwards.
+        
+        Nested batches only flush when the outermost one exits.
+        """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            self.canvas.configure(state='disabled')
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.canvas.configure(state='normal')
+                self.canvas.update_idletasks()
+    
     def update_warehouse_size(self):
         """Update canvas size and redraw"""
-        canvas_width = int(self.warehouse_width_m * self.scale)
-        canvas_height = int(self.warehouse_height_m * self.scale)
-        
-        self.canvas.config(scrollregion=(0, 0, canvas_width, canvas_height))
-        self.draw_warehouse_boundary()
-        self.draw_grid()
-        self.draw_origin()
-        self.redraw_all_racks()
-        self.redraw_path()
-        self.update_stats()
+        self._canvas_w_px = self.warehouse_width_m * self.scale
+        self._canvas_h_px = self.warehouse_height_m * self.scale
+        canvas_width = int(self._canvas_w_px)
+        canvas_height = int(self._canvas_h_px)
+        
+        with self._batch_canvas():
+            self.canvas.config(scrollregion=(0, 0, canvas_width, canvas_height))
+            self.draw_warehouse_boundary()
+            self.draw_grid()
+            self.draw_origin()
+            self.redraw_all_racks()
+            self.redraw_path()
+            self.update_stats()
+    
+    def _px(self, m):
+        """Convert meters to whole canvas pixels; canvas items get integer coordinates so Tk never has to round them"""
+        return int(round(m * self.scale))
     
     def draw_warehouse_boundary(self):
         """Draw warehouse boundary rectangle"""
         self.canvas.delete('boundary')
-        width_px = self.warehouse_width_m * self.scale
-        height_px = self.warehouse_height_m * self.scale
+        width_px = self._px(self.warehouse_width_m)
+        height_px = self._px(self.warehouse_height_m)
         
         # Draw thick border
         self.canvas.create_rectangle(0, 0, width_px, height_px,
                                      outline='black', width=3, tags='boundary')
         self.canvas.tag_lower('boundary')
     
+    def _clear_canvas(self):
+        """Delete the layout's items (racks and path), forgetting the ids of the items kept across redraws.
+        
+        Everything drawn from the layout is tagged 'user'. The background (grid, boundary, origin) is left in place,
+        to be updated by the next update_warehouse_size rather than torn down and rebuilt.
+        """
+        self.canvas.delete('user')
+        for rack in self.racks:
+            rack.canvas_id = None
+        self.path_lines.clear()
+        self.waypoint_markers.clear()
+        self._path_drawn = self._path_drawn[:0]
+    
+    def _sync_items(self, ids, count, create):
+        """Grow or shrink a list of canvas item ids to count, creating only the missing items and deleting only the extras"""
+        while len(ids) > count:
+            self.canvas.delete(ids.pop())
+        while len(ids) < count:
+            ids.append(create(len(ids)))
+    
+    def scroll_x(self, *args):
+        """Scroll the canvas horizontally, then re-cull the grid"""
+        self.canvas.xview(*args)
+        self.schedule_grid_redraw()
+    
+    def scroll_y(self, *args):
+        """Scroll the canvas vertically, then re-cull the grid"""
+        self.canvas.yview(*args)
+        self.schedule_grid_redraw()
+    
+    def schedule_grid_redraw(self):
+        """Redraw the grid once the pending viewport events have been handled"""
+        if not self._grid_redraw_pending:
+            self._grid_redraw_pending = True
+            self.canvas.after_idle(self._redraw_grid_idle)
+    
+    def _redraw_grid_idle(self):
+        self._grid_redraw_pending = False
+        self.draw_grid()
+    
+    def _visible_lines(self, start_px, end_px, count):
+        """First and last index of the meter lines between canvas pixels start_px and end_px, clipped to [0, count)"""
+        first = max(0, int(start_px // self.scale))
+        last = min(count - 1, int(end_px // self.scale) + 1)
+        return first, last
+    
     def draw_grid(self):
         """Draw background grid"""
-        self.canvas.delete('grid')
-        
-        # Draw meter grid lines
-        for i in range(0, int(self.warehouse_width_m) + 1):
-            x = i * self.scale
-            self.canvas.create_line(x, 0, x, self.warehouse_height_m * self.scale,
-                                  fill='lightgray', tags='grid')
-            if i % 5 == 0:  # Label every 5 meters
-                self.canvas.create_text(x, 10, text=f'{i}m', 
-                                      fill='gray', tags='grid')
-        
-        for i in range(0, int(self.warehouse_height_m) + 1):
-            y = i * self.scale
-            self.canvas.create_line(0, y, self.warehouse_width_m * self.scale, y,
-                                  fill='lightgray', tags='grid')
-            if i % 5 == 0:
-                self.canvas.create_text(10, y, text=f'{i}m',
-                                      fill='gray', tags='grid')
-        
-        self.canvas.tag_lower('grid')
+        # Only the lines and labels inside the visible viewport are drawn.
+        # The lines are rasterized into one image tile covering them, blitted as a single canvas item;
+        # the labels are text items moved into place with coords(), created/deleted only when their number changes
+        # The loops below run once per visible line/label, so the canvas methods and the scale are bound to locals up front
+        canvas = self.canvas
+        coords = canvas.coords
+        itemconfigure = canvas.itemconfigure
+        scale = self.scale
+        width_px = int(round(self.warehouse_width_m * scale))
+        height_px = int(round(self.warehouse_height_m * scale))
+        v_count = int(self.warehouse_width_m) + 1
+        h_count = int(self.warehouse_height_m) + 1
+        v_first, v_last = self._visible_lines(canvas.canvasx(0), canvas.canvasx(canvas.winfo_width()), v_count)
+        h_first, h_last = self._visible_lines(canvas.canvasy(0), canvas.canvasy(canvas.winfo_height()), h_count)
+        
+        def new_label(k):
+            return canvas.create_text(0, 0, fill='gray', tags='grid')
+        
+        # Draw meter grid lines (the tile reaches the warehouse edge once the last line is visible)
+        x0 = int(round(v_first * scale))
+        y0 = int(round(h_first * scale))
+        x1 = width_px if v_last == v_count - 1 else int(round(v_last * scale))
+        y1 = height_px if h_last == h_count - 1 else int(round(h_last * scale))
+        xs = tuple(int(round(i * scale)) - x0 for i in range(v_first, v_last + 1))
+        ys = tuple(int(round(i * scale)) - y0 for i in range(h_first, h_last + 1))
+        src = _grid_lines_image(xs, ys, max(1, x1 - x0 + 1), max(1, y1 - y0 + 1))
+        if src is not self._grid_photo_src:
+            self._grid_photo = ImageTk.PhotoImage(src)
+            self._grid_photo_src = src
+        if self._grid_image_id is None:
+            self._grid_image_id = canvas.create_image(x0, y0, image=self._grid_photo, anchor='nw', tags='grid')
+        else:
+            coords(self._grid_image_id, x0, y0)
+            itemconfigure(self._grid_image_id, image=self._grid_photo)
+        
+        # Label every 5 meters
+        label_first = -(-v_first // 5)
+        self._sync_items(self._grid_v_label_ids, max(0, v_last // 5 - label_first + 1), new_label)
+        for i, item in zip(range(label_first * 5, v_last + 1, 5), self._grid_v_label_ids):
+            coords(item, int(round(i * scale)), 10)
+            itemconfigure(item, text=f'{i}m')
+        
+        label_first = -(-h_first // 5)
+        self._sync_items(self._grid_h_label_ids, max(0, h_last // 5 - label_first + 1), new_label)
+        for i, item in zip(range(label_first * 5, h_last + 1, 5), self._grid_h_label_ids):
+            coords(item, 10, int(round(i * scale)))
+            itemconfigure(item, text=f'{i}m')
+        
+        canvas.tag_lower('grid')
     
     def draw_origin(self):
         """Draw world origin marker"""
         self.canvas.delete('origin')
         
-        ox = self.origin_x_m * self.scale
-        oy = self.origin_y_m * self.scale
+        ox = self._px(self.origin_x_m)
+        oy = self._px(self.origin_y_m)
         
         size = 20
         # Draw crosshair
@@ -580,14 +1157,10 @@ class WarehouseDesigner:
             self.scale = new_scale
             
             # Scale all rack positions
-            for rack in self.racks:
-                rack.x *= scale_factor
-                rack.y *= scale_factor
+            self.racks.xy *= scale_factor
             
             # Scale waypoints
-            for i in range(len(self.waypoints)):
-                x, y = self.waypoints[i]
-                self.waypoints[i] = (x * scale_factor, y * scale_factor)
+            self.waypoints *= scale_factor
             
             self.update_warehouse_size()
             
@@ -605,9 +1178,10 @@ class WarehouseDesigner:
     def change_mode(self):
         """Change placement mode"""
         self.mode = self.mode_var.get()
+        previous = self.selected_rack
         self.selected_rack = None
         self.selected_rack_idx = None
-        self.redraw_all_racks()
+        self._recolor_selection(previous)
         
         if self.mode == "path":
             self.status_bar.config(text="Path Mode: Click to add waypoints")
@@ -619,8 +1193,8 @@ class WarehouseDesigner:
         x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
         
         # Check if click is within warehouse bounds
-        if x < 0 or x > self.warehouse_width_m * self.scale or \
-           y < 0 or y > self.warehouse_height_m * self.scale:
+        if x < 0 or x > self._canvas_w_px or \
+           y < 0 or y > self._canvas_h_px:
             return
         
         if self.mode == "single":
@@ -628,7 +1202,7 @@ class WarehouseDesigner:
         elif self.mode == "row":
             self.drag_start = (x, y)
             self.temp_line = self.canvas.create_line(x, y, x, y, 
-                                                     fill='blue', dash=(5, 5))
+                                                     fill='blue', dash=(5, 5), tags='user')
         elif self.mode == "grid":
             self.place_grid(x, y)
         elif self.mode == "select":
@@ -653,12 +1227,21 @@ class WarehouseDesigner:
             new_x = self.selected_rack.x + dx
             new_y = self.selected_rack.y + dy
             
-            if 0 <= new_x <= self.warehouse_width_m * self.scale and \
-               0 <= new_y <= self.warehouse_height_m * self.scale:
+            if 0 <= new_x <= self._canvas_w_px and \
+               0 <= new_y <= self._canvas_h_px:
                 self.selected_rack.x = new_x
                 self.selected_rack.y = new_y
                 self.drag_start = (x, y)
-                self.draw_rack(self.selected_rack, selected=True)
+                # Motion events arrive far faster than frames: redraw once per idle cycle, at the latest position
+                if not self._drag_scheduled:
+                    self._drag_scheduled = True
+                    self.canvas.after_idle(self._flush_drag)
+    
+    def _flush_drag(self):
+        """Redraw the dragged rack at its current position"""
+        self._drag_scheduled = False
+        if self.selected_rack is not None:
+            self.draw_rack(self.selected_rack, selected=True)
     
     def canvas_release(self, event):
         """Handle canvas release"""
@@ -674,26 +1257,49 @@ class WarehouseDesigner:
         elif self.mode == "select":
             self.drag_start = None
     
+    @property
+    def waypoints(self):
+        """(N, 2) array of the path waypoints in canvas x, y (a live view of the buffer)"""
+        return self._wp_buf[:self._wp_len]
+    
+    @waypoints.setter
+    def waypoints(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(-1, 2)
+        self._reserve_waypoints(len(values))
+        self._wp_buf[:len(values)] = values
+        self._wp_len = len(values)
+    
+    def _reserve_waypoints(self, count):
+        """Grow the waypoint buffer (doubling) so it can hold count waypoints"""
+        capacity = len(self._wp_buf)
+        if count <= capacity:
+            return
+        new = np.empty((max(count, 2 * capacity), 2), dtype=np.float64)
+        new[:self._wp_len] = self._wp_buf[:self._wp_len]
+        self._wp_buf = new
+    
     def add_waypoint(self, x, y):
         """Add a waypoint to the path"""
-        self.waypoints.append((x, y))
-        self.redraw_path()
+        self._reserve_waypoints(self._wp_len + 1)
+        self._wp_buf[self._wp_len] = (x, y)
+        self._wp_len += 1
+        self.schedule_path_redraw()
         self.update_stats()
         self.status_bar.config(text=f"Path Mode: {len(self.waypoints)} waypoints")
     
     def clear_path(self):
         """Clear all waypoints"""
-        if self.waypoints and messagebox.askyesno("Confirm", "Clear all waypoints?"):
-            self.waypoints.clear()
-            self.redraw_path()
+        if len(self.waypoints) and messagebox.askyesno("Confirm", "Clear all waypoints?"):
+            self.waypoints = np.empty((0, 2), dtype=np.float64)
+            self.schedule_path_redraw()
             self.update_stats()
             self.status_bar.config(text="Path cleared")
     
     def undo_last_waypoint(self):
         """Remove the last waypoint from the path"""
-        if self.waypoints:
-            self.waypoints.pop()
-            self.redraw_path()
+        if len(self.waypoints):
+            self._wp_len -= 1
+            self.schedule_path_redraw()
             self.update_stats()
             remaining = len(self.waypoints)
             self.status_bar.config(text=f"Path Mode: {remaining} waypoint{'s' if remaining != 1 else ''}")
@@ -707,46 +1313,73 @@ class WarehouseDesigner:
                 new_rotation = float(self.rotation_var.get())
                 self.selected_rack.rotation = new_rotation % 360
                 self.draw_rack(self.selected_rack, selected=True)
-                messagebox.showinfo("Success", f"Rotation set to {self.selected_rack.rotation}°")
+                self.status_bar.config(text=f"Rotation set to {self.selected_rack.rotation}°")
             except ValueError:
                 messagebox.showerror("Error", "Invalid rotation value")
         else:
             messagebox.showwarning("Warning", "No rack selected")
     
+    def schedule_path_redraw(self):
+        """Redraw the path once the pending events have been handled, so a burst of waypoint edits costs one redraw"""
+        if not self._path_redraw_pending:
+            self._path_redraw_pending = True
+            self.canvas.after_idle(self._redraw_path_idle)
+    
+    def _redraw_path_idle(self):
+        self._path_redraw_pending = False
+        self.redraw_path()
+    
     def redraw_path(self):
         """Redraw the path with waypoints"""
-        # Clear existing path elements
-        for line_id in self.path_lines:
-            self.canvas.delete(line_id)
-        for marker_id in self.waypoint_markers:
-            self.canvas.delete(marker_id)
+        # Segments and markers are pooled: items are only created/deleted when the number of waypoints changes,
+        # and only the items from the first moved waypoint onwards are repositioned with coords()
+        canvas = self.canvas
+        coords = canvas.coords
+        # Whole-pixel coordinates for the canvas items
+        points = np.rint(self.waypoints).astype(int)
+        n = len(points)
+        
+        drawn = self._path_drawn
+        m = min(len(drawn), n)
+        unchanged = (drawn[:m] == points[:m]).all(axis=1)
+        first = m if unchanged.all() else int(np.argmin(unchanged))
+        
+        r = 8
+        
+        def new_segment(k):
+            return canvas.create_line(0, 0, 0, 0, fill='green', width=3,
+                                      arrow=tk.LAST, arrowshape=(10, 12, 5), tags=('user', 'path_line'))
+        
+        def new_marker(k):
+            if k % 2 == 0:
+                # Circle marker
+                return canvas.create_oval(0, 0, 0, 0, fill='yellow', outline='green', width=2,
+                                          tags=('user', 'path_marker'))
+            # Number label
+            return canvas.create_text(0, 0, text=str(k // 2 + 1), fill='black',
+                                      font=('Arial', 10, 'bold'), tags=('user', 'path_marker'))
         
-        self.path_lines.clear()
-        self.waypoint_markers.clear()
+        self._sync_items(self.path_lines, max(0, n - 1), new_segment)
+        self._sync_items(self.waypoint_markers, 2 * n, new_marker)
         
-        if not self.waypoints:
-            return
+        waypoints = points.tolist()
         
         # Draw lines between waypoints
-        for i in range(len(self.waypoints) - 1):
-            x1, y1 = self.waypoints[i]
-            x2, y2 = self.waypoints[i + 1]
-            line_id = self.canvas.create_line(x1, y1, x2, y2, 
-                                             fill='green', width=3, 
-                                             arrow=tk.LAST, arrowshape=(10, 12, 5))
-            self.path_lines.append(line_id)
+        for i in range(max(0, first - 1), n - 1):
+            x1, y1 = waypoints[i]
+            x2, y2 = waypoints[i + 1]
+            coords(self.path_lines[i], x1, y1, x2, y2)
         
         # Draw waypoint markers
-        for idx, (x, y) in enumerate(self.waypoints):
-            # Circle marker
-            r = 8
-            circle_id = self.canvas.create_oval(x-r, y-r, x+r, y+r, 
-                                               fill='yellow', outline='green', width=2)
-            # Number label
-            text_id = self.canvas.create_text(x, y, text=str(idx+1), 
-                                             fill='black', font=('Arial', 10, 'bold'))
-            self.waypoint_markers.append(circle_id)
-            self.waypoint_markers.append(text_id)
+        for i in range(first, n):
+            x, y = waypoints[i]
+            coords(self.waypoint_markers[2 * i], x - r, y - r, x + r, y + r)
+            coords(self.waypoint_markers[2 * i + 1], x, y)
+        
+        # Keep the path above everything else, and the markers above the segments
+        canvas.tag_raise('path_line')
+        canvas.tag_raise('path_marker')
+        self._path_drawn = points
     
     def place_rack(self, x, y):
         """Place a single rack"""
@@ -786,18 +1419,11 @@ class WarehouseDesigner:
             ux = dx / length
             uy = dy / length
             
-            # Place racks along the line
+            # Place racks along the line, skipping those outside the warehouse
             spacing_px = spacing * self.scale
-            for i in range(count):
-                rx = x1 + ux * spacing_px * i
-                ry = y1 + uy * spacing_px * i
-                
-                # Check bounds
-                if 0 <= rx <= self.warehouse_width_m * self.scale and \
-                   0 <= ry <= self.warehouse_height_m * self.scale:
-                    rack = Rack(rx, ry, width, depth, rotation, rack_type)
-                    self.racks.append(rack)
-                    self.draw_rack(rack)
+            positions = _row_positions(x1, y1, ux, uy, spacing_px, count,
+                                       self._canvas_w_px, self._canvas_h_px)
+            self._add_racks(positions, width, depth, rotation, rack_type)
             
             self.update_stats()
             
@@ -819,69 +1445,71 @@ class WarehouseDesigner:
             spacing_px = spacing * self.scale
             row_spacing_px = row_spacing * self.scale
             
-            for row in range(rows):
-                for col in range(count):
-                    rx = x + col * spacing_px
-                    ry = y + row * row_spacing_px
-                    
-                    # Check bounds
-                    if 0 <= rx <= self.warehouse_width_m * self.scale and \
-                       0 <= ry <= self.warehouse_height_m * self.scale:
-                        rack = Rack(rx, ry, width, depth, rotation, rack_type)
-                        self.racks.append(rack)
-                        self.draw_rack(rack)
+            # Racks outside the warehouse are skipped
+            positions = _grid_positions(x, y, count, rows, spacing_px, row_spacing_px,
+                                        self._canvas_w_px, self._canvas_h_px)
+            self._add_racks(positions, width, depth, rotation, rack_type)
             
             self.update_stats()
             
         except ValueError:
             messagebox.showerror("Error", "Invalid parameters")
     
-    def draw_rack(self, rack, selected=False):
-        """Draw a rack on canvas"""
-        if rack.canvas_id:
-            self.canvas.delete(rack.canvas_id)
-        
-        # Calculate rack corners based on rotation
-        w_px = rack.width_m * self.scale
-        h_px = rack.depth_m * self.scale
-        
-        angle_rad = math.radians(rack.rotation)
-        cos_a = math.cos(angle_rad)
-        sin_a = math.sin(angle_rad)
-        
-        # Corner points (rotated)
-        corners = [
-            (-w_px/2, -h_px/2),
-            (w_px/2, -h_px/2),
-            (w_px/2, h_px/2),
-            (-w_px/2, h_px/2)
-        ]
+    def _add_racks(self, positions, width, depth, rotation, rack_type):
+        """Add and draw identical racks at an (N, 2) array of canvas positions"""
+        racks = [Rack(rx, ry, width, depth, rotation, rack_type) for rx, ry in positions.tolist()]
+        self.racks.extend(racks)
+        
+        # They all share one size and rotation, so their corners come from one vectorized pass
+        corners = _rack_corners(positions, np.broadcast_to((width, depth), positions.shape), None, self.scale,
+                                cos_sin=_rotation_cos_sin(rotation))
+        for rack, polygon in zip(racks, np.rint(corners).astype(int).reshape(-1, 8).tolist()):
+            self.draw_rack(rack, polygon=polygon)
+    
+    def draw_rack(self, rack, selected=False, polygon=None):
+        """Draw a rack on canvas
         
-        rotated = []
-        for cx, cy in corners:
-            rx = cx * cos_a - cy * sin_a + rack.x
-            ry = cx * sin_a + cy * cos_a + rack.y
-            rotated.extend([rx, ry])
+        An already drawn rack keeps its canvas item and is just moved and recolored, which is much cheaper than
+        deleting and recreating it; a new item is only created for a rack that isn't on the canvas yet.
+        polygon can pass in corners already computed for many racks at once (see redraw_all_racks).
+        """
+        if polygon is None:
+            polygon = self._rack_polygon(rack)
         
         color = 'red' if selected else 'gray'
-        rack.canvas_id = self.canvas.create_polygon(rotated, fill=color, 
-                                                    outline='darkgray', width=2)
+        if rack.canvas_id is not None:
+            self.canvas.coords(rack.canvas_id, polygon)
+            self.canvas.itemconfigure(rack.canvas_id, fill=color)
+            return
+        
+        rack.canvas_id = self.canvas.create_polygon(polygon, fill=color, 
+                                                    outline='darkgray', width=2, tags='user')
+    
+    def _rack_polygon(self, rack):
+        """Flat [x1, y1, ..., x4, y4] list of the rack's rotated corners in whole canvas pixels"""
+        corners = _rack_corners(np.array([(rack.x, rack.y)]), [(rack.width_m, rack.depth_m)], None, self.scale,
+                                cos_sin=_rotation_cos_sin(rack.rotation))
+        return np.rint(corners).astype(int).ravel().tolist()
     
     def redraw_all_racks(self):
         """Redraw all racks"""
-        for idx, rack in enumerate(self.racks):
+        # Corners of every rack in one vectorized pass, as whole-pixel flat polygon lists
+        polygons = np.rint(self.racks.corners(self.scale)).astype(int).reshape(-1, 8).tolist()
+        for idx, (rack, polygon) in enumerate(zip(self.racks, polygons)):
             selected = (idx == self.selected_rack_idx)
-            self.draw_rack(rack, selected)
+            self.draw_rack(rack, selected, polygon=polygon)
     
     def select_rack(self, x, y):
         """Select a rack at position"""
+        previous = self.selected_rack
         self.selected_rack = None
         self.selected_rack_idx = None
         
-        for idx, rack in enumerate(self.racks):
-            # Simple distance check
-            dist = math.sqrt((rack.x - x)**2 + (rack.y - y)**2)
-            if dist < self.scale:  # Within 1 meter
+        # Simple distance check: pick the first rack within 1 meter
+        if len(self.racks):
+            idx = self.racks.first_within(x, y, self.scale)
+            if idx is not None:
+                rack = self.racks[idx]
                 self.selected_rack = rack
                 self.selected_rack_idx = idx
                 
@@ -889,9 +1517,18 @@ class WarehouseDesigner:
                 self.width_var.set(str(rack.width_m))
                 self.depth_var.set(str(rack.depth_m))
                 self.rotation_var.set(str(rack.rotation))
-                break
         
-        self.redraw_all_racks()
+        self._recolor_selection(previous)
+    
+    def _recolor_selection(self, previous):
+        """Update the canvas after the selection moved away from previous (a Rack or None).
+        
+        A selection change only changes the fill of the previously and newly selected racks, so just
+        those two items are recolored in place instead of redrawing every rack.
+        """
+        for rack in {previous, self.selected_rack} - {None}:
+            if rack._store is self.racks and rack.canvas_id is not None:
+                self.canvas.itemconfigure(rack.canvas_id, fill='red' if rack is self.selected_rack else 'gray')
     
     def delete_selected(self):
         """Delete selected rack"""
@@ -925,57 +1562,47 @@ class WarehouseDesigner:
     def clear_all(self):
         """Clear all racks and path"""
         if messagebox.askyesno("Confirm", "Delete all racks and path?"):
-            self.canvas.delete('all')
+            self._clear_canvas()
             self.racks.clear()
-            self.waypoints.clear()
-            self.path_lines.clear()
-            self.waypoint_markers.clear()
+            self.waypoints = np.empty((0, 2), dtype=np.float64)
             self.selected_rack = None
             self.selected_rack_idx = None
             self.update_warehouse_size()
             self.update_stats()
     
+    def waypoints_world(self):
+        """(N, 2) array of the waypoints in world coordinates, in JSON (x, y) order"""
+        # Convert to meters relative to origin, for all waypoints at once
+        world = np.round(self.waypoints / self.scale - (self.origin_x_m, self.origin_y_m), 3)
+        
+        # Swap x and y: canvas Y is world X
+        return world[:, ::-1]
+    
     def waypoints_to_dict(self):
         """Convert waypoints to world coordinates"""
-        waypoints_world = []
-        for x_px, y_px in self.waypoints:
-            # Convert to meters
-            x_m = x_px / self.scale
-            y_m = y_px / self.scale
-            
-            # Relative to origin
-            world_x = x_m - self.origin_x_m
-            world_y = y_m - self.origin_y_m
-            
-            # Swap x and y
-            waypoints_world.append({
-                'x': round(world_y, 3),
-                'y': round(world_x, 3)
-            })
-        
-        return waypoints_world
+        return [{'x': x, 'y': y} for x, y in self.waypoints_world().tolist()]
+    
+    def path_txt(self):
+        """Path waypoints as the character command script written to TXT files"""
+        # Build the whole file in one join and write it once, rather than a write() call per waypoint
+        lines = [f"Character GoTo {x} {y} 0.0 _\n" for x, y in self.waypoints_world().tolist()]
+        return "Character Idle 10\n" + "".join(lines)
     
     def waypoints_from_dict(self, waypoints_data):
         """Load waypoints from world coordinates"""
-        self.waypoints.clear()
+        self.waypoints_from_world([(wp['x'], wp['y']) for wp in waypoints_data])
+    
+    def waypoints_from_world(self, world):
+        """Load waypoints from an (N, 2) array of world coordinates in JSON (x, y) order"""
+        # Swap back: JSON x is canvas y, JSON y is canvas x
+        world = np.asarray(world, dtype=np.float64).reshape(-1, 2)[:, ::-1]
         
-        for wp in waypoints_data:
-            # Swap back
-            world_x = wp['y']
-            world_y = wp['x']
-            
-            # Convert to canvas
-            x_m = world_x + self.origin_x_m
-            y_m = world_y + self.origin_y_m
-            
-            x_px = x_m * self.scale
-            y_px = y_m * self.scale
-            
-            self.waypoints.append((x_px, y_px))
+        # Convert to canvas, for all waypoints at once
+        self.waypoints = (world + (self.origin_x_m, self.origin_y_m)) * self.scale
     
     def export_path_txt(self):
         """Export path waypoints to a TXT file"""
-        if not self.waypoints:
+        if not len(self.waypoints):
             messagebox.showwarning("Warning", "No waypoints to export!")
             return
         
@@ -986,17 +1613,12 @@ class WarehouseDesigner:
         
         if filename:
             try:
-                waypoints_world = self.waypoints_to_dict()
-                
                 with open(filename, 'w') as f:
-                    f.write("Character Idle 10\n")
-
-                    for idx, wp in enumerate(waypoints_world):
-                        f.write(f"Character GoTo {wp['x']} {wp['y']} 0.0 _\n")
+                    f.write(self.path_txt())
                 
                 messagebox.showinfo("Success", 
                                   f"Path exported to {filename}\n"
-                                  f"Total waypoints: {len(waypoints_world)}")
+                                  f"Total waypoints: {len(self.waypoints)}")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export path: {e}")
@@ -1009,42 +1631,38 @@ class WarehouseDesigner:
         
         if filename:
             try:
-                waypoints_data = []
-                
                 with open(filename, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip comments and empty lines
-                        if not line or line.startswith('#'):
-                            continue
-                        
-                        # Parse: waypoint_number, x, y
+                    lines = [line.strip() for line in f.read().splitlines()]
+                # Skip comments and empty lines
+                lines = [line for line in lines if line and not line.startswith('#')]
+                
+                # Parse: waypoint_number, x, y
+                try:
+                    # Well-formed files are parsed in one go by NumPy's C parser
+                    world = np.loadtxt(lines, delimiter=',', usecols=(1, 2), comments=None, ndmin=2) if lines else []
+                except ValueError:
+                    # Some line is malformed: parse line by line, skipping the lines that don't parse
+                    world = []
+                    for line in lines:
                         parts = line.split(',')
                         if len(parts) >= 3:
                             try:
-                                x = float(parts[1].strip())
-                                y = float(parts[2].strip())
-                                waypoints_data.append({'x': x, 'y': y})
+                                world.append((float(parts[1].strip()), float(parts[2].strip())))
                             except ValueError:
                                 continue
                 
-                if not waypoints_data:
+                if not len(world):
                     messagebox.showwarning("Warning", "No valid waypoints found in file!")
                     return
                 
-                # Clear existing waypoints
-                self.waypoints.clear()
-                self.path_lines.clear()
-                self.waypoint_markers.clear()
-                
-                # Load new waypoints
-                self.waypoints_from_dict(waypoints_data)
+                # Load new waypoints, replacing the existing ones
+                self.waypoints_from_world(world)
                 self.redraw_path()
                 self.update_stats()
                 
                 messagebox.showinfo("Success", 
                                   f"Path loaded from {filename}\n"
-                                  f"Total waypoints: {len(waypoints_data)}")
+                                  f"Total waypoints: {len(world)}")
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load path: {e}")
@@ -1067,15 +1685,14 @@ class WarehouseDesigner:
                     'x': self.origin_x_m,
                     'y': self.origin_y_m
                 },
-                'racks': [rack.to_dict(self.origin_x_m, self.origin_y_m, self.scale) 
-                         for rack in self.racks],
+                'racks': self.racks.to_dicts(self.origin_x_m, self.origin_y_m, self.scale),
                 'path': {
                     'waypoints': self.waypoints_to_dict()
                 }
             }
             
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(_dumps(data))
             
             # Automatically save PNG and TXT with same name
             png_filename = filename.rsplit('.', 1)[0] + '.png'
@@ -1083,39 +1700,51 @@ class WarehouseDesigner:
 
             saved_files = [filename]
             errors = []
+            # (filename, label, future) of the writes running on the I/O thread
+            pending = []
 
             try:
-                self.export_png_to_file(png_filename)
-                saved_files.append(png_filename)
+                pending.append((png_filename, "PNG", self.export_png_to_file(png_filename)))
             except Exception as e:
                 errors.append(f"PNG: {e}")
 
             # Save TXT file if waypoints exist
-            if self.waypoints:
-                try:
-                    waypoints_world = self.waypoints_to_dict()
-                    with open(txt_filename, 'w') as f:
-                        f.write("Character Idle 10\n")
-                        for idx, wp in enumerate(waypoints_world):
-                            f.write(f"Character GoTo {wp['x']} {wp['y']} 0.0 _\n")
-                    saved_files.append(txt_filename)
-                except Exception as e:
-                    errors.append(f"TXT: {e}")
-
-            # Show result message
-            if not errors:
-                files_list = "\n".join(saved_files)
-                messagebox.showinfo("Success", 
-                                f"Files saved:\n{files_list}\n\n"
-                                f"Warehouse Type: {self.warehouse_var.get()}\n"
-                                f"Racks: {len(self.racks)}\n"
-                                f"Waypoints: {len(self.waypoints)}\n"
-                                f"Positions are relative to origin at ({self.origin_x_m}, {self.origin_y_m})")
-            else:
-                error_msg = "\n".join(errors)
-                messagebox.showwarning("Partial Success", 
-                                    f"JSON saved successfully to {filename}\n"
-                                    f"But encountered errors:\n{error_msg}")
+            if len(self.waypoints):
+                pending.append((txt_filename, "TXT", self._io_pool.submit(_write_text, txt_filename, self.path_txt())))
+
+            # Describe the layout as it is now: it may be edited while the files are being written
+            summary = (f"Warehouse Type: {self.warehouse_var.get()}\n"
+                       f"Racks: {len(self.racks)}\n"
+                       f"Waypoints: {len(self.waypoints)}\n"
+                       f"Positions are relative to origin at ({self.origin_x_m}, {self.origin_y_m})")
+
+            def report():
+                for name, label, future in pending:
+                    if future.exception() is None:
+                        saved_files.append(name)
+                    else:
+                        errors.append(f"{label}: {future.exception()}")
+                
+                # Show result message
+                if not errors:
+                    files_list = "\n".join(saved_files)
+                    messagebox.showinfo("Success", 
+                                    f"Files saved:\n{files_list}\n\n"
+                                    f"{summary}")
+                else:
+                    error_msg = "\n".join(errors)
+                    messagebox.showwarning("Partial Success", 
+                                        f"JSON saved successfully to {filename}\n"
+                                        f"But encountered errors:\n{error_msg}")
+            
+            self._when_done([future for _, _, future in pending], report)
+    
+    def _when_done(self, futures, callback):
+        """Call callback on the Tk thread once all futures have finished, polling without blocking the event loop"""
+        if all(future.done() for future in futures):
+            callback()
+        else:
+            self.root.after(50, self._when_done, futures, callback)
     
     def load_layout(self):
         """Load layout from JSON file"""
@@ -1125,15 +1754,13 @@ class WarehouseDesigner:
         
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
+                with open(filename, 'rb') as f:
+                    data = _loads(f.read())
                 
                 # Clear existing
-                self.canvas.delete('all')
+                self._clear_canvas()
                 self.racks.clear()
-                self.waypoints.clear()
-                self.path_lines.clear()
-                self.waypoint_markers.clear()
+                self.waypoints = np.empty((0, 2), dtype=np.float64)
                 
                 # Load settings
                 self.scale = data.get('scale', 50)
@@ -1157,10 +1784,8 @@ class WarehouseDesigner:
                 self.origin_y_var.set(str(self.origin_y_m))
                 
                 # Load racks
-                for rack_data in data['racks']:
-                    rack = Rack.from_dict(rack_data, self.origin_x_m, 
-                                         self.origin_y_m, self.scale)
-                    self.racks.append(rack)
+                self.racks.extend(Rack.from_dicts(data['racks'], self.origin_x_m,
+                                                  self.origin_y_m, self.scale))
                 
                 # Load path
                 if 'path' in data and 'waypoints' in data['path']:
@@ -1183,81 +1808,57 @@ class WarehouseDesigner:
         
         if filename:
             try:
-                self.export_png_to_file(filename)
-                messagebox.showinfo("Success", f"Image exported to {filename}")
+                future = self.export_png_to_file(filename)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export image: {e}")
+                return
+            
+            def report():
+                if future.exception() is None:
+                    messagebox.showinfo("Success", f"Image exported to {filename}")
+                else:
+                    messagebox.showerror("Error", f"Failed to export image: {future.exception()}")
+            
+            self._when_done([future], report)
     
     def export_png_to_file(self, filename):
-        """Export canvas as PNG image to specified filename"""
-        # Get canvas dimensions
-        width = int(self.warehouse_width_m * self.scale)
-        height = int(self.warehouse_height_m * self.scale)
-        
-        # Create image
-        image = Image.new('RGB', (width, height), 'white')
+        """Export canvas as PNG image to specified filename
+        
+        The image is drawn on the calling thread; encoding and writing it runs on the I/O thread.
+        Returns the concurrent.futures.Future of that write.
+        """
+        # Start from a copy of the static background (grid, boundary, origin), which only changes with the
+        # scale, warehouse size or origin, so repeated saves of the same warehouse don't redraw it
+        image = _png_background(self.scale, self.warehouse_width_m, self.warehouse_height_m,
+                                self.origin_x_m, self.origin_y_m).copy()
         draw = ImageDraw.Draw(image)
+        # Bind the draw methods once, the loops below call them once per rack, segment and waypoint
+        draw_polygon = draw.polygon
+        draw_line = draw.line
+        draw_ellipse = draw.ellipse
+        draw_text = draw.text
         
-        # Draw grid
-        for i in range(0, int(self.warehouse_width_m) + 1):
-            x = i * self.scale
-            draw.line([(x, 0), (x, height)], fill='lightgray', width=1)
-        
-        for i in range(0, int(self.warehouse_height_m) + 1):
-            y = i * self.scale
-            draw.line([(0, y), (width, y)], fill='lightgray', width=1)
-        
-        # Draw boundary
-        draw.rectangle([0, 0, width-1, height-1], outline='black', width=3)
-        
-        # Draw origin
-        ox = int(self.origin_x_m * self.scale)
-        oy = int(self.origin_y_m * self.scale)
-        size = 20
-        draw.line([(ox - size, oy), (ox + size, oy)], fill='blue', width=2)
-        draw.line([(ox, oy - size), (ox, oy + size)], fill='blue', width=2)
-        draw.ellipse([ox-5, oy-5, ox+5, oy+5], fill='blue', outline='darkblue')
-        
-        # Draw racks
-        for rack in self.racks:
-            w_px = rack.width_m * self.scale
-            h_px = rack.depth_m * self.scale
-            
-            angle_rad = math.radians(rack.rotation)
-            cos_a = math.cos(angle_rad)
-            sin_a = math.sin(angle_rad)
-            
-            corners = [
-                (-w_px/2, -h_px/2),
-                (w_px/2, -h_px/2),
-                (w_px/2, h_px/2),
-                (-w_px/2, h_px/2)
-            ]
-            
-            rotated = []
-            for cx, cy in corners:
-                rx = cx * cos_a - cy * sin_a + rack.x
-                ry = cx * sin_a + cy * cos_a + rack.y
-                rotated.append((rx, ry))
-            
-            draw.polygon(rotated, fill='gray', outline='darkgray')
+        # Draw racks, with the corners of all of them computed in one vectorized pass
+        for polygon in self.racks.corners(self.scale).reshape(-1, 8).tolist():
+            draw_polygon(polygon, fill='gray', outline='darkgray')
         
         # Draw path
         if len(self.waypoints) > 1:
             # Draw lines between waypoints
-            for i in range(len(self.waypoints) - 1):
-                x1, y1 = self.waypoints[i]
-                x2, y2 = self.waypoints[i + 1]
-                draw.line([(x1, y1), (x2, y2)], fill='green', width=3)
+            waypoints = self.waypoints.tolist()
+            for i in range(len(waypoints) - 1):
+                x1, y1 = waypoints[i]
+                x2, y2 = waypoints[i + 1]
+                draw_line([(x1, y1), (x2, y2)], fill='green', width=3)
         
         # Draw waypoint markers
-        for idx, (x, y) in enumerate(self.waypoints):
+        for idx, (x, y) in enumerate(self.waypoints.tolist()):
             r = 8
-            draw.ellipse([x-r, y-r, x+r, y+r], fill='yellow', outline='green', width=2)
+            draw_ellipse([x-r, y-r, x+r, y+r], fill='yellow', outline='green', width=2)
             # Draw number (simplified, as PIL text requires font setup)
-            draw.text((x-3, y-6), str(idx+1), fill='black')
+            draw_text((x-3, y-6), str(idx+1), fill='black')
         
-        image.save(filename)
+        return self._io_pool.submit(image.save, filename)
 
 
 def main():